@@ -0,0 +1,127 @@
+"""Content-coding negotiation and streaming encoders.
+
+gzip is always available. brotli and zstd are offered when the ``brotli``
+and ``zstandard`` packages are installed.
+"""
+
+import zlib
+from typing import Dict, List, Optional
+from .config import get_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+settings = get_settings()
+
+# Server preference when the client rates several codings equally
+PREFERENCE = ["br", "zstd", "gzip"]
+
+# File suffix of each coding's precompressed static variant
+SUFFIXES = {"br": ".br", "zstd": ".zst", "gzip": ".gz"}
+
+# Only text-like types are worth compressing: images, archives, PDFs and
+# office documents are compressed already and would only burn CPU.
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "application/manifest+json",
+    "image/svg+xml",
+}
+
+
+class GzipEncoder:
+    def __init__(self):
+        # wbits=31 writes a gzip header and trailer
+        self._compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.compression_brotli_quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=settings.compression_zstd_level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+ENCODERS: Dict[str, type] = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        # Events must reach the client as they are sent, not when a block fills
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+def accepted_encodings(accept_encoding: str, available: List[str]) -> List[str]:
+    """Codings from ``available`` the client accepts, best first.
+
+    Follows the q-values of ``Accept-Encoding`` (``*`` included) and breaks
+    ties with the server's preference order.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.strip().split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    ranked = []
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > 0:
+            ranked.append((-weight, PREFERENCE.index(coding), coding))
+    return [coding for *_, coding in sorted(ranked)]
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """The best coding this server can produce for ``Accept-Encoding``, if any."""
+    accepted = accepted_encodings(accept_encoding, list(ENCODERS))
+    return accepted[0] if accepted else None
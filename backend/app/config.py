@@ -4,9 +4,64 @@ from functools import lru_cache
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./employee_hub.db"
+    # Comma-separated read replica URLs; list and detail reads are spread over them
+    database_replica_urls: str = ""
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64000
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_temp_store: str = "MEMORY"
+    sqlite_serialize_writes: bool = True
     secret_key: str = "your-super-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    principal_cache_size: int = 1024
+    principal_cache_ttl_seconds: int = 60
+    # The active announcement feed is cached until the next post expires or
+    # a write clears it, and never for longer than this
+    announcement_feed_ttl_seconds: int = 300
+    # Feeds with more active posts than this are read from the database
+    announcement_feed_max_rows: int = 1000
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 32
+    log_level: str = "INFO"
+    # Statements slower than this are logged; 0 disables the slow-query log
+    slow_query_threshold_ms: float = 200
+    # Responses at least this large are compressed for clients that accept it
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+    # The built frontend is served by the API when this directory exists
+    frontend_dist_dir: str = "../frontend/dist"
+    # Changes older than this are pruned at startup; 0 keeps them all
+    change_log_retention_days: int = 30
+    # Most GET sub-requests one POST /batch may carry
+    batch_max_requests: int = 20
+    # A batched GET still running after this long answers 504
+    batch_request_timeout_seconds: float = 10
+    # Events a GET /events client may fall behind by before it is disconnected
+    event_queue_size: int = 64
+    # Open event streams per worker; more are turned away with 503
+    event_max_subscribers: int = 10000
+    event_heartbeat_seconds: float = 15
+    # How long a ticket from POST /events/ticket may wait before it opens a stream
+    event_ticket_ttl_seconds: float = 30
+    # How workers tell each other which cached data a write made stale:
+    # sqlite:///file (workers on one host), redis://host:port/db or memory://
+    invalidation_bus_url: str = "sqlite:///./invalidation_bus.db"
+    invalidation_bus_poll_interval_ms: int = 100
+    invalidation_bus_retention_seconds: int = 300
+    upload_dir: str = "uploads"
+    upload_chunk_size: int = 1024 * 1024
+    max_upload_size: int = 100 * 1024 * 1024
 
     class Config:
         env_file = ".env"
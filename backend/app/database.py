@@ -1,20 +1,206 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import threading
+from typing import Dict
+from fastapi import Depends
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import await_only
 from .config import get_settings
+from .metrics import instrument_engine
 
 settings = get_settings()
 
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-engine = create_engine(settings.database_url, connect_args=connect_args)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend in ASYNC_DRIVERS and parsed.drivername == backend:
+        parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    return parsed.render_as_string(hide_password=False)
+
+
+is_sqlite = settings.database_url.startswith("sqlite")
+connect_args = {"check_same_thread": False} if is_sqlite else {}
+
+pool_options = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
+    "pool_pre_ping": settings.db_pool_pre_ping,
+}
+
+replica_urls = [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+
+# The blocking engine serves migrations, startup maintenance and scripts such
+# as seed_data.py; request handlers use the async engines below.
+engine = create_engine(settings.database_url, connect_args=connect_args, **pool_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def create_request_engine(url: str):
+    # aiosqlite defaults to NullPool for files, which would open a connection
+    # (and a driver thread) per request; pool them like the blocking engine does.
+    sqlite = url.startswith("sqlite")
+    return create_async_engine(
+        async_database_url(url),
+        connect_args={"check_same_thread": False} if sqlite else {},
+        **({"poolclass": AsyncAdaptedQueuePool} if sqlite else {}),
+        **pool_options
+    )
+
+
+async_engine = create_request_engine(settings.database_url)
+replica_engines = [create_request_engine(url) for url in replica_urls]
+_next_replica = itertools.cycle(replica_engines)
+
+
+class RoutingSession(Session):
+    """Session class driven by AsyncSession that can read from a replica.
+
+    Sessions opened with ``info={"replica": engine}`` send plain SELECTs to
+    that replica; flushes and INSERT/UPDATE/DELETE statements always go to
+    the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is None or self._flushing or (clause is not None and clause.is_dml):
+            return async_engine.sync_engine
+        return replica.sync_engine
+
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession
+)
+
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+def configure_sqlite(engine: Engine) -> None:
+    """Apply the SQLite performance profile from Settings to every new connection."""
+    pragmas = [
+        ("journal_mode", settings.sqlite_journal_mode),
+        ("synchronous", settings.sqlite_synchronous),
+        ("mmap_size", settings.sqlite_mmap_size),
+        ("cache_size", settings.sqlite_cache_size),
+        ("busy_timeout", settings.sqlite_busy_timeout_ms),
+        ("temp_store", settings.sqlite_temp_store),
+    ]
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def serialize_writes(session_factory, asynchronous: bool = False) -> None:
+    """Let only one session per process write at a time.
+
+    SQLite allows a single writer. Without this, concurrent writers in the
+    same worker race for the database lock and spin in busy_timeout (or fail
+    with "database is locked"). Sessions take the lock just before their
+    first INSERT/UPDATE/DELETE and release it when the transaction ends.
+    Reads never take it. Sessions driven by AsyncSession wait on an
+    asyncio.Lock so queued writers do not block the event loop.
+    """
+    if asynchronous:
+        lock = asyncio.Lock()
+
+        def wait_for_lock():
+            await_only(lock.acquire())
+    else:
+        lock = threading.Lock()
+        wait_for_lock = lock.acquire
+
+    def acquire(session, bind_arguments=None):
+        if not session.info.get("holds_write_lock"):
+            # Check out the connection first: waiting for the lock while other
+            # waiters hold every pooled connection would deadlock the pool
+            session.connection(bind_arguments)
+            wait_for_lock()
+            session.info["holds_write_lock"] = True
+
+    @event.listens_for(session_factory, "before_flush")
+    def before_flush(session, flush_context, instances):
+        acquire(session)
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def before_execute(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            acquire(orm_execute_state.session, dict(orm_execute_state.bind_arguments))
+
+    @event.listens_for(session_factory, "after_transaction_end")
+    def after_transaction_end(session, transaction):
+        if transaction.parent is None and session.info.pop("holds_write_lock", False):
+            lock.release()
+
+
+if is_sqlite:
+    configure_sqlite(engine)
+    configure_sqlite(async_engine.sync_engine)
+    if settings.sqlite_serialize_writes:
+        serialize_writes(SessionLocal)
+        serialize_writes(RoutingSession, asynchronous=True)
+
+for replica in replica_engines:
+    if replica.dialect.name == "sqlite":
+        configure_sqlite(replica.sync_engine)
+
+for request_engine in (async_engine, *replica_engines):
+    instrument_engine(request_engine.sync_engine)
+
+
+def pool_stats() -> Dict[str, dict]:
+    """Connection pool utilization of the primary and every replica."""
+    engines = [("primary", async_engine)]
+    engines.extend((f"replica_{i}", replica) for i, replica in enumerate(replica_engines))
+    stats = {}
+    for name, request_engine in engines:
+        pool = request_engine.pool
+        capacity = pool.size() + settings.db_max_overflow
+        stats[name] = {
+            "capacity": capacity,
+            "open": pool.checkedin() + pool.checkedout(),
+            "checked_out": pool.checkedout(),
+            "utilization": round(pool.checkedout() / capacity, 4) if capacity else 0.0,
+        }
+    return stats
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db(primary: AsyncSession = Depends(get_db)):
+    """Session for read-only handlers, pinned to one replica when any are configured.
+
+    Without replicas this is the request's ``get_db`` session: two sessions on
+    one pool would let concurrent requests each hold a connection while
+    waiting for a second one, until the pool times out.
+
+    Replicas lag the primary, so handlers that must see their own writes
+    should keep using ``get_db``.
+    """
+    replica = next(_next_replica, None)
+    if replica is None:
+        yield primary
+        return
+    async with AsyncSessionLocal(info={"replica": replica}) as db:
         yield db
-    finally:
-        db.close()
@@ -1,21 +1,50 @@
+import logging
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
+from fastapi.responses import PlainTextResponse
+from .config import get_settings
+from .database import engine, async_engine, replica_engines, SessionLocal, pool_stats
+from .metrics import TimedRoute, render_metric, request_metrics
+from .middleware import CompressionMiddleware, FrontendMiddleware, RequestMetricsMiddleware
+from .migrate import run_migrations
 from .routers import (
     auth_router,
     employees_router,
     leaves_router,
     announcements_router,
-    documents_router
+    documents_router,
+    dashboard_router,
+    batch_router,
+    changes_router,
+    events_router
 )
+from .services.announcements import feed_cache
+from .services.changes import prune_changes
+from .services.counters import ensure_counters
+from .services.events import event_broker
+from .services.invalidation import invalidation_bus
+from .services.search import ensure_search_indexes
+from .utils.auth import principal_cache
+from .utils.hashing import hashing_pool
+from .utils.pagination import NEXT_CURSOR_HEADER
 
-Base.metadata.create_all(bind=engine)
+settings = get_settings()
+logging.basicConfig(level=settings.log_level, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+run_migrations()
+ensure_search_indexes(engine)
+
+with SessionLocal() as db:
+    ensure_counters(db)
+    prune_changes(db)
 
 app = FastAPI(
     title="Employee Hub API",
     description="A comprehensive employee management system",
     version="1.0.0"
 )
+app.router.route_class = TimedRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,13 +52,41 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+if os.path.isdir(settings.frontend_dist_dir):
+    app.add_middleware(
+        FrontendMiddleware,
+        directory=settings.frontend_dist_dir,
+        passthrough=(app.docs_url, app.redoc_url, "/health", "/metrics")
+    )
 
 app.include_router(auth_router)
 app.include_router(employees_router)
 app.include_router(leaves_router)
 app.include_router(announcements_router)
 app.include_router(documents_router)
+app.include_router(dashboard_router)
+app.include_router(batch_router)
+app.include_router(changes_router)
+app.include_router(events_router)
+
+
+@app.on_event("startup")
+async def startup():
+    await invalidation_bus.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    event_broker.close()
+    await invalidation_bus.stop()
+    hashing_pool.shutdown()
+    await async_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
 
 
 @app.get("/")
@@ -39,4 +96,44 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "principal_cache": principal_cache.stats(),
+        "announcement_feed_cache": feed_cache.stats(),
+        "password_hashing": hashing_pool.stats(),
+        "event_streams": event_broker.stats(),
+        "invalidation_bus": invalidation_bus.stats(),
+        "database_pools": pool_stats()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    pools = pool_stats()
+    cache = principal_cache.stats()
+    hashing = hashing_pool.stats()
+    events = event_broker.stats()
+    lines = request_metrics.render()
+    for field, description in (
+        ("capacity", "Connections the pool may open"),
+        ("open", "Connections currently open"),
+        ("checked_out", "Connections currently in use"),
+    ):
+        lines += render_metric(
+            f"db_pool_{field}", "gauge", description,
+            [({"pool": name}, stats[field]) for name, stats in pools.items()]
+        )
+    lines += render_metric("principal_cache_entries", "gauge", "Cached principals", [({}, cache["size"])])
+    lines += render_metric("principal_cache_hits_total", "counter", "Principal cache hits", [({}, cache["hits"])])
+    lines += render_metric("principal_cache_misses_total", "counter", "Principal cache misses", [({}, cache["misses"])])
+    lines += render_metric(
+        "password_hash_in_flight", "gauge", "Password hashes in flight", [({}, hashing["in_flight"])]
+    )
+    lines += render_metric(
+        "password_hash_rejected_total", "counter", "Password hashes rejected while busy", [({}, hashing["rejected"])]
+    )
+    lines += render_metric("event_stream_subscribers", "gauge", "Open event streams", [({}, events["subscribers"])])
+    lines += render_metric(
+        "event_stream_dropped_total", "counter", "Event streams dropped for falling behind", [({}, events["dropped"])]
+    )
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
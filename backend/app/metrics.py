@@ -0,0 +1,223 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import get_settings
+
+settings = get_settings()
+slow_query_logger = logging.getLogger("app.slow_query")
+
+# Upper bounds of the latency histograms, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    """What the current request has spent so far, filled in as it runs."""
+
+    __slots__ = ("route", "queries", "db_time", "handler_time", "handler_end")
+
+    def __init__(self):
+        self.route: Optional[str] = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.handler_time = 0.0
+        self.handler_end: Optional[float] = None
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def start_request() -> RequestStats:
+    stats = RequestStats()
+    _current_request.set(stats)
+    return stats
+
+
+def current_request() -> Optional[RequestStats]:
+    return _current_request.get()
+
+
+def end_request() -> None:
+    _current_request.set(None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Charge every statement to the current request and log slow ones."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+        threshold = settings.slow_query_threshold_ms
+        if threshold and elapsed * 1000 >= threshold:
+            # Parameters are left out: they can carry personal data and hashes
+            slow_query_logger.warning(json.dumps({
+                "event": "slow_query",
+                "duration_ms": round(elapsed * 1000, 2),
+                "route": stats.route if stats else None,
+                "statement": " ".join(statement.split()),
+            }))
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[List[str]]:
+    """Collect the statements ``engine`` executes inside the block."""
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that labels the request with its path template and times the endpoint."""
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, endpoint, **kwargs)
+        call = self.dependant.call
+
+        if asyncio.iscoroutinefunction(call):
+            async def timed_call(**values):
+                start = time.perf_counter()
+                try:
+                    return await call(**values)
+                finally:
+                    _record_handler(start)
+        else:
+            def timed_call(**values):
+                start = time.perf_counter()
+                try:
+                    return call(**values)
+                finally:
+                    _record_handler(start)
+
+        self.dependant.call = timed_call
+
+    async def handle(self, scope, receive, send):
+        stats = _current_request.get()
+        if stats is not None:
+            stats.route = self.path_format
+        await super().handle(scope, receive, send)
+
+
+def _record_handler(start: float) -> None:
+    stats = _current_request.get()
+    if stats is not None:
+        stats.handler_end = time.perf_counter()
+        stats.handler_time = stats.handler_end - start
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.total:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+class RequestMetrics:
+    """Per-route request histograms rendered in the Prometheus text format."""
+
+    HISTOGRAMS = (
+        ("http_request_duration_seconds", "Time to serve the request", DURATION_BUCKETS),
+        ("http_request_db_seconds", "Time spent executing SQL statements", DURATION_BUCKETS),
+        ("http_request_serialization_seconds", "Time from handler return to response start", DURATION_BUCKETS),
+        ("http_request_queries", "SQL statements executed per request", QUERY_COUNT_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+
+    def observe(self, method: str, route: str, status: int, duration: float,
+                db_time: float, serialization: float, queries: int) -> None:
+        values = (duration, db_time, serialization, queries)
+        with self._lock:
+            key = (method, route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            for (name, _, buckets), value in zip(self.HISTOGRAMS, values):
+                histogram = self._histograms.get((name, method, route))
+                if histogram is None:
+                    histogram = self._histograms[(name, method, route)] = Histogram(buckets)
+                histogram.observe(value)
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP http_requests_total Requests served",
+            "# TYPE http_requests_total counter",
+        ]
+        with self._lock:
+            for (method, route, status), count in sorted(self._requests.items()):
+                lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+            for name, description, _ in self.HISTOGRAMS:
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, method, route), histogram in sorted(self._histograms.items()):
+                    if metric == name:
+                        lines.extend(histogram.samples(name, _labels(method=method, route=route)))
+        return lines
+
+
+def render_metric(name: str, kind: str, description: str, samples: Iterable[Tuple[dict, float]]) -> List[str]:
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        label_text = f"{{{_labels(**labels)}}}" if labels else ""
+        lines.append(f"{name}{label_text} {value:g}")
+    return lines
+
+
+request_metrics = RequestMetrics()
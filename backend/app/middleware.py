@@ -0,0 +1,238 @@
+import json
+import logging
+import mimetypes
+import os
+import stat
+import time
+from typing import Sequence
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .compression import ENCODERS, SUFFIXES, accepted_encodings, is_compressible, negotiate
+from .config import get_settings
+from .metrics import end_request, request_metrics, start_request
+
+settings = get_settings()
+
+request_logger = logging.getLogger("app.requests")
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class RequestMetricsMiddleware:
+    """Time every HTTP request and report where the time went.
+
+    Adds a ``Server-Timing`` header (database, handler, serialization and
+    total time up to the response headers), records per-route histograms for
+    ``/metrics`` and writes one JSON log line per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_request()
+        start = time.perf_counter()
+        status_code = 500
+        serialization = 0.0
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code, serialization
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                status_code = message["status"]
+                if stats.handler_end is not None:
+                    serialization = now - stats.handler_end
+                headers = MutableHeaders(raw=list(message.get("headers", [])))
+                headers.append("server-timing", ", ".join([
+                    f'db;dur={_ms(stats.db_time)};desc="{stats.queries} queries"',
+                    f"app;dur={_ms(stats.handler_time)}",
+                    f"serialize;dur={_ms(serialization)}",
+                    f"total;dur={_ms(now - start)}",
+                ]))
+                message["headers"] = headers.raw
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration = time.perf_counter() - start
+            route = stats.route or "unmatched"
+            request_metrics.observe(
+                scope["method"], route, status_code, duration,
+                stats.db_time, serialization, stats.queries
+            )
+            request_logger.info(json.dumps({
+                "event": "request",
+                "method": scope["method"],
+                "route": route,
+                "path": scope["path"],
+                "status": status_code,
+                "queries": stats.queries,
+                "db_ms": _ms(stats.db_time),
+                "handler_ms": _ms(stats.handler_time),
+                "serialize_ms": _ms(serialization),
+                "total_ms": _ms(duration),
+            }))
+            end_request()
+
+
+def _should_compress(status_code: int, headers: MutableHeaders) -> bool:
+    return (
+        200 <= status_code and status_code not in (204, 206, 304)
+        and "content-encoding" not in headers
+        and "content-range" not in headers
+        and is_compressible(headers.get("content-type"))
+    )
+
+
+class CompressionMiddleware:
+    """Compress text-like responses with the best coding the client accepts.
+
+    Bodies under ``compression_minimum_size`` are sent as they are, and so
+    are responses that are already encoded, partial (byte ranges) or of a
+    type that is compressed already, such as most document downloads.
+    Streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start = None
+        encoder = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first chunk shows how big the body is
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if start is not None:
+                headers = MutableHeaders(raw=list(start.get("headers", [])))
+                body = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if _should_compress(start["status"], headers):
+                    headers.add_vary_header("Accept-Encoding")
+                    if coding and (more_body or len(body) >= settings.compression_minimum_size):
+                        encoder = ENCODERS[coding]()
+                        body = encoder.compress(body)
+                        del headers["content-length"]
+                        if not more_body:
+                            body += encoder.finish()
+                            headers["content-length"] = str(len(body))
+                        headers["content-encoding"] = coding
+                        # Byte ranges would address the uncompressed file
+                        del headers["accept-ranges"]
+                        # The encoded bytes differ, so a strong validator must not match them
+                        etag = headers.get("etag")
+                        if etag and not etag.startswith("W/"):
+                            headers["etag"] = f"W/{etag}"
+                        message = {**message, "body": body}
+                await send({**start, "headers": headers.raw})
+                start = None
+            elif encoder is not None:
+                body = encoder.compress(message.get("body", b""))
+                if not message.get("more_body", False):
+                    body += encoder.finish()
+                message = {**message, "body": body}
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+
+class PrecompressedFiles(StaticFiles):
+    """Static files that prefer a ``.br``/``.zst``/``.gz`` sibling the client accepts.
+
+    Vite puts content-hashed bundles under ``assets/``; those never change
+    and are cached for a year. Everything else (``index.html`` above all)
+    must be revalidated so a new build is picked up.
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        media_type = mimetypes.guess_type(str(full_path))[0] or "application/octet-stream"
+
+        response = None
+        for coding in accepted_encodings(request_headers.get("accept-encoding", ""), list(SUFFIXES)):
+            variant = f"{full_path}{SUFFIXES[coding]}"
+            try:
+                variant_stat = os.stat(variant)
+            except FileNotFoundError:
+                continue
+            response = FileResponse(
+                variant, status_code=status_code, stat_result=variant_stat,
+                media_type=media_type, headers={"content-encoding": coding}
+            )
+            break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, media_type=media_type)
+
+        relative = os.path.relpath(full_path, self.directory)
+        if relative.startswith("assets" + os.sep):
+            response.headers["cache-control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["cache-control"] = "no-cache"
+        response.headers["vary"] = "Accept-Encoding"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class FrontendMiddleware:
+    """Serve the built frontend bundle from the API process.
+
+    Requests for files in ``directory`` are answered from it. Browser
+    navigations (GET/HEAD accepting text/html on a path without a file
+    extension) get ``index.html``, so client-side routes that share a path
+    with the API, like /employees, load the app; ``passthrough`` prefixes
+    such as /docs always reach the API. Everything else goes to the API
+    untouched, without a filesystem lookup.
+    """
+
+    def __init__(self, app: ASGIApp, directory: str, passthrough: Sequence[str] = ()):
+        self.app = app
+        self.files = PrecompressedFiles(directory=directory)
+        self.passthrough = tuple(passthrough)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = None
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD") \
+                and not scope["path"].startswith(self.passthrough):
+            response = await self._lookup(scope)
+        if response is None:
+            await self.app(scope, receive, send)
+            return
+        await response(scope, receive, send)
+
+    async def _lookup(self, scope: Scope):
+        path = scope["path"]
+        if "." in path.rsplit("/", 1)[-1]:
+            candidate = path.lstrip("/")
+        elif "text/html" in Headers(scope=scope).get("accept", ""):
+            candidate = "index.html"
+        else:
+            return None
+
+        full_path, stat_result = await anyio.to_thread.run_sync(self.files.lookup_path, candidate)
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return None
+        return self.files.file_response(full_path, stat_result, scope)
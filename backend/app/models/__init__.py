@@ -3,5 +3,8 @@ from .employee import Employee
 from .leave import Leave
 from .announcement import Announcement
 from .document import Document
+from .counter import Counter
+from .blob import Blob
+from .change import Change, ChangeLogState
 
-__all__ = ["User", "Employee", "Leave", "Announcement", "Document"]
+__all__ = ["User", "Employee", "Leave", "Announcement", "Document", "Counter", "Blob", "Change", "ChangeLogState"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Index, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -13,6 +13,11 @@ class Priority(str, enum.Enum):
 
 class Announcement(Base):
     __tablename__ = "announcements"
+    __table_args__ = (
+        Index("ix_announcements_created_at_id", "created_at", "id"),
+        Index("ix_announcements_priority_created_at_id", "priority", "created_at", "id"),
+        Index("ix_announcements_expires_at", "expires_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -21,5 +26,8 @@ class Announcement(Base):
     priority = Column(Enum(Priority, native_enum=False), default=Priority.MEDIUM, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by every UPDATE; detail ETags are derived from it
+    version = Column(Integer, nullable=False, server_default="1", onupdate=literal_column("version") + 1)
 
-    author = relationship("User", back_populates="announcements")
+    author = relationship("User", back_populates="announcements", lazy="raise")
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, BigInteger, String
+from ..database import Base
+
+
+class Blob(Base):
+    __tablename__ = "blobs"
+
+    content_hash = Column(String(64), primary_key=True)
+    file_path = Column(String(500), nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class Change(Base):
+    """One create, update or delete of a synced row, in commit order.
+
+    ``id`` is the feed token clients pass back as ``since``; AUTOINCREMENT
+    keeps SQLite from reusing ids once old changes are pruned.
+    """
+
+    __tablename__ = "changes"
+    __table_args__ = (
+        Index("ix_changes_created_at", "created_at"),
+        # Serves the per-table version lookup behind list ETags
+        Index("ix_changes_entity_id", "entity", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)
+    # Set when only this employee (and managers) may see the row
+    employee_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ChangeLogState(Base):
+    """Single row recording how far the change log has been pruned.
+
+    Tokens below ``pruned_through`` may have lost changes and get a 410. The
+    oldest remaining id cannot tell: the newest change of each table is kept
+    as that table's version.
+    """
+
+    __tablename__ = "change_log_state"
+
+    id = Column(Integer, primary_key=True)
+    pruned_through = Column(Integer, nullable=False, default=0)
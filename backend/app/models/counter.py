@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+
+class Counter(Base):
+    __tablename__ = "counters"
+
+    metric = Column(String(50), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
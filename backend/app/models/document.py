@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Text, Index, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -6,13 +6,23 @@ from ..database import Base
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_created_at_id", "created_at", "id"),
+        Index("ix_documents_category_created_at_id", "category", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text)
     file_path = Column(String(500), nullable=False)
+    file_size = Column(BigInteger)
+    content_hash = Column(String(64))
+    content_type = Column(String(255))
     category = Column(String(100))
     uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by every UPDATE; detail ETags are derived from it
+    version = Column(Integer, nullable=False, server_default="1", onupdate=literal_column("version") + 1)
 
-    uploaded_by_user = relationship("User", back_populates="documents")
+    uploaded_by_user = relationship("User", back_populates="documents", lazy="raise")
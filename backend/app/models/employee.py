@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, literal_column
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from ..database import Base
 
 
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        Index("ix_employees_department_id", "department", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
@@ -16,7 +20,10 @@ class Employee(Base):
     position = Column(String(100))
     hire_date = Column(Date)
     avatar_url = Column(String(500))
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by every UPDATE; detail ETags are derived from it
+    version = Column(Integer, nullable=False, server_default="1", onupdate=literal_column("version") + 1)
 
-    user = relationship("User", back_populates="employee")
-    leaves = relationship("Leave", back_populates="employee", foreign_keys="Leave.employee_id")
-    approved_leaves = relationship("Leave", back_populates="approver", foreign_keys="Leave.approved_by")
+    user = relationship("User", back_populates="employee", lazy="raise")
+    leaves = relationship("Leave", back_populates="employee", foreign_keys="Leave.employee_id", lazy="raise")
+    approved_leaves = relationship("Leave", back_populates="approver", foreign_keys="Leave.approved_by", lazy="raise")
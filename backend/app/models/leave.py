@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum, Text, Index, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -22,6 +22,11 @@ class LeaveStatus(str, enum.Enum):
 
 class Leave(Base):
     __tablename__ = "leaves"
+    __table_args__ = (
+        Index("ix_leaves_created_at_id", "created_at", "id"),
+        Index("ix_leaves_employee_id_created_at_id", "employee_id", "created_at", "id"),
+        Index("ix_leaves_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
@@ -33,6 +38,8 @@ class Leave(Base):
     approved_by = Column(Integer, ForeignKey("employees.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by every UPDATE; detail ETags are derived from it
+    version = Column(Integer, nullable=False, server_default="1", onupdate=literal_column("version") + 1)
 
-    employee = relationship("Employee", back_populates="leaves", foreign_keys=[employee_id])
-    approver = relationship("Employee", back_populates="approved_leaves", foreign_keys=[approved_by])
+    employee = relationship("Employee", back_populates="leaves", foreign_keys=[employee_id], lazy="raise")
+    approver = relationship("Employee", back_populates="approved_leaves", foreign_keys=[approved_by], lazy="raise")
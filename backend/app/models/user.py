@@ -20,6 +20,6 @@ class User(Base):
     role = Column(Enum(UserRole, native_enum=False), default=UserRole.EMPLOYEE, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    employee = relationship("Employee", back_populates="user", uselist=False)
-    announcements = relationship("Announcement", back_populates="author")
-    documents = relationship("Document", back_populates="uploaded_by_user")
+    employee = relationship("Employee", back_populates="user", uselist=False, lazy="raise")
+    announcements = relationship("Announcement", back_populates="author", lazy="raise")
+    documents = relationship("Document", back_populates="uploaded_by_user", lazy="raise")
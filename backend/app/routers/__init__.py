@@ -3,11 +3,19 @@ from .employees import router as employees_router
 from .leaves import router as leaves_router
 from .announcements import router as announcements_router
 from .documents import router as documents_router
+from .dashboard import router as dashboard_router
+from .batch import router as batch_router
+from .changes import router as changes_router
+from .events import router as events_router
 
 __all__ = [
     "auth_router",
     "employees_router",
     "leaves_router",
     "announcements_router",
-    "documents_router"
+    "documents_router",
+    "dashboard_router",
+    "batch_router",
+    "changes_router",
+    "events_router"
 ]
@@ -1,49 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from datetime import datetime
 from typing import List, Optional
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.announcement import Announcement, Priority
 from ..models.user import User, UserRole
 from ..schemas.announcement import AnnouncementCreate, AnnouncementResponse
+from ..services.announcements import FEED_ORDER, active_feed, active_filter
+from ..services.events import event_broker
+from ..services.invalidation import ANNOUNCEMENTS, invalidation_bus
 from ..utils.auth import get_current_active_user, require_role
+from ..utils.conditional import list_etag, row_etag, set_etag
+from ..utils.pagination import paginate, set_next_cursor
+from ..utils.rows import Projection, projection
+from ..metrics import TimedRoute
 
-router = APIRouter(prefix="/announcements", tags=["Announcements"])
+router = APIRouter(prefix="/announcements", tags=["Announcements"], route_class=TimedRoute)
+
+
+def _next_expiry():
+    # The default list shrinks when an announcement expires, without any write
+    return (
+        select(func.min(Announcement.expires_at))
+        .where(Announcement.expires_at > datetime.utcnow())
+        .scalar_subquery()
+    )
 
 
 @router.get("/", response_model=List[AnnouncementResponse])
-def get_announcements(
+async def get_announcements(
     priority: Optional[Priority] = Query(None),
     include_expired: bool = Query(False),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    fields: Projection = Depends(projection(AnnouncementResponse, Announcement)),
+    etag: str = Depends(list_etag(Announcement, extra=_next_expiry)),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    query = db.query(Announcement)
-
-    if not include_expired:
-        query = query.filter(
-            or_(
-                Announcement.expires_at.is_(None),
-                Announcement.expires_at > datetime.utcnow()
-            )
-        )
-
-    if priority:
-        query = query.filter(Announcement.priority == priority)
-
-    return query.order_by(Announcement.created_at.desc()).offset(skip).limit(limit).all()
+    feed = None if include_expired else await active_feed(db, priority)
+    if feed is not None:
+        announcements, next_cursor = feed.page(fields.columns, cursor, skip, limit)
+    else:
+        query = select(*fields.columns)
+        if not include_expired:
+            query = query.where(active_filter())
+        if priority:
+            query = query.where(Announcement.priority == priority)
+        announcements, next_cursor = await paginate(db, query, FEED_ORDER, cursor, skip, limit)
+
+    response = fields.response(announcements)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
+    return response
 
 
 @router.get("/{announcement_id}", response_model=AnnouncementResponse)
-def get_announcement(
+async def get_announcement(
     announcement_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    etag: Optional[str] = Depends(row_etag(Announcement, "announcement_id")),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    announcement = db.query(Announcement).filter(Announcement.id == announcement_id).first()
+    set_etag(response, etag)
+    announcement = await db.get(Announcement, announcement_id)
     if not announcement:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -53,9 +76,9 @@ def get_announcement(
 
 
 @router.post("/", response_model=AnnouncementResponse, status_code=status.HTTP_201_CREATED)
-def create_announcement(
+async def create_announcement(
     announcement_data: AnnouncementCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
 ):
     new_announcement = Announcement(
@@ -63,19 +86,21 @@ def create_announcement(
         **announcement_data.model_dump()
     )
     db.add(new_announcement)
-    db.commit()
-    db.refresh(new_announcement)
+    await db.commit()
+    await invalidation_bus.publish(ANNOUNCEMENTS, new_announcement.id)
+    await db.refresh(new_announcement)
+    await event_broker.publish_announcement(AnnouncementResponse.model_validate(new_announcement).model_dump(mode="json"))
     return new_announcement
 
 
 @router.put("/{announcement_id}", response_model=AnnouncementResponse)
-def update_announcement(
+async def update_announcement(
     announcement_id: int,
     announcement_data: AnnouncementCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
 ):
-    announcement = db.query(Announcement).filter(Announcement.id == announcement_id).first()
+    announcement = await db.get(Announcement, announcement_id)
     if not announcement:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,18 +116,19 @@ def update_announcement(
     for field, value in announcement_data.model_dump().items():
         setattr(announcement, field, value)
 
-    db.commit()
-    db.refresh(announcement)
+    await db.commit()
+    await invalidation_bus.publish(ANNOUNCEMENTS, announcement_id)
+    await db.refresh(announcement)
     return announcement
 
 
 @router.delete("/{announcement_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_announcement(
+async def delete_announcement(
     announcement_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
 ):
-    announcement = db.query(Announcement).filter(Announcement.id == announcement_id).first()
+    announcement = await db.get(Announcement, announcement_id)
     if not announcement:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -115,6 +141,7 @@ def delete_announcement(
             detail="Not authorized to delete this announcement"
         )
 
-    db.delete(announcement)
-    db.commit()
+    await db.delete(announcement)
+    await db.commit()
+    await invalidation_bus.publish(ANNOUNCEMENTS, announcement_id)
     return None
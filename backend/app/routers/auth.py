@@ -1,40 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta, date
 from ..database import get_db
 from ..models.user import User
 from ..models.employee import Employee
 from ..schemas.user import UserCreate, UserResponse, Token
+from ..services import counters
+from ..services.invalidation import USERS, invalidation_bus
 from ..utils.auth import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    password_needs_rehash,
     create_access_token,
     get_current_active_user
 )
 from ..config import get_settings
+from ..metrics import TimedRoute
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TimedRoute)
 settings = get_settings()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
+    existing_user = await db.scalar(select(User.id).where(User.email == user_data.email))
+    # As in login: hold no connection while waiting on bcrypt
+    await db.rollback()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         email=user_data.email,
         password_hash=hashed_password,
         role=user_data.role
     )
     db.add(new_user)
-    db.flush()
+    await db.flush()
 
     # Extract name from email for employee profile
     email_name = user_data.email.split('@')[0]
@@ -53,37 +60,58 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         hire_date=date.today()
     )
     db.add(new_employee)
-    db.commit()
-    db.refresh(new_user)
+    await counters.track_employee(db, new_employee)
+    await db.commit()
+    await invalidation_bus.publish(USERS, new_user.email)
+    await db.refresh(new_user)
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    account = (await db.execute(
+        select(User.id, User.email, User.role, User.password_hash).where(User.email == form_data.username)
+    )).one_or_none()
+    # Give the connection back while bcrypt runs: far more logins may wait
+    # on the hashing pool than the database pool has connections
+    await db.rollback()
+    if account is None or not await verify_password_async(form_data.password, account.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Upgrade hashes created with a different cost factor while we still
+    # have the plaintext password
+    if password_needs_rehash(account.password_hash):
+        password_hash = await get_password_hash_async(form_data.password)
+        # Through the ORM, so that the flush evicts the cached principal
+        (await db.get(User, account.id)).password_hash = password_hash
+        await db.commit()
+        await invalidation_bus.publish(USERS, account.email)
+
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.email, "role": user.role.value},
+        data={"sub": account.email, "role": account.role.value},
         expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_active_user)):
+async def get_me(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # Lazy loading cannot run under AsyncSession, so fetch the profile explicitly
+    employee = await db.scalar(select(Employee).where(Employee.user_id == current_user.id))
     response = {
         "id": current_user.id,
         "email": current_user.email,
         "role": current_user.role,
         "created_at": current_user.created_at,
-        "first_name": current_user.employee.first_name if current_user.employee else None,
-        "last_name": current_user.employee.last_name if current_user.employee else None
+        "first_name": employee.first_name if employee else None,
+        "last_name": employee.last_name if employee else None
     }
     return response
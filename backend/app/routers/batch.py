@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import sys
+from typing import List, Tuple
+from urllib.parse import urlsplit
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from ..config import get_settings
+from ..database import get_db
+from ..models.user import User
+from ..schemas.batch import BatchRequest, BatchRequestItem, BatchResponse
+from ..utils.auth import BATCH_PRINCIPAL, get_current_active_user
+from ..metrics import TimedRoute, current_request, start_request
+
+if sys.version_info < (3, 11):
+    # anyio raises the backport's groups before Python has its own
+    from exceptiongroup import BaseExceptionGroup
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batch", tags=["Batch"], route_class=TimedRoute)
+
+# Request headers that describe the batch body rather than the sub-requests
+BATCH_ONLY_HEADERS = {b"content-length", b"content-type", b"transfer-encoding", b"accept-encoding"}
+
+# Responses that never end, and so cannot be collected into a batch
+STREAMING_TYPES = (b"text/event-stream",)
+
+JSON_HEADERS = [(b"content-type", b"application/json")]
+
+
+class StreamingResponseRejected(Exception):
+    pass
+
+
+def _sub_scope(request: Request, item: BatchRequestItem, principal: User) -> dict:
+    url = urlsplit(item.path)
+    headers = [(name, value) for name, value in request.scope["headers"] if name not in BATCH_ONLY_HEADERS]
+    overrides = {name.lower().encode("latin-1"): value.encode("latin-1") for name, value in item.headers.items()}
+    headers = [(name, value) for name, value in headers if name not in overrides] + list(overrides.items())
+    scope = {
+        **request.scope,
+        "method": "GET",
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        "state": {},
+        BATCH_PRINCIPAL: principal,
+    }
+    for key in ("route", "endpoint", "path_params"):
+        scope.pop(key, None)
+    return scope
+
+
+async def _run(request: Request, item: BatchRequestItem, principal: User, slots: asyncio.Semaphore) -> Tuple[int, list, bytes]:
+    """Dispatch one GET straight to the router and collect its response."""
+    received = False
+    status_code = 500
+    headers: list = []
+    body: List[bytes] = []
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses listen for a disconnect until they finish
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal status_code, headers
+        if message["type"] == "http.response.start":
+            content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+            if content_type.startswith(STREAMING_TYPES):
+                # Raised before the body starts, which cancels the stream
+                raise StreamingResponseRejected()
+            status_code = message["status"]
+            headers = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    async with slots:
+        # Sub-requests are charged to the batch in /metrics, not to their own routes
+        batch_stats = current_request()
+        stats = start_request()
+        try:
+            await asyncio.wait_for(
+                request.app.router(_sub_scope(request, item, principal), receive, send),
+                settings.batch_request_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            return 504, JSON_HEADERS, b'{"detail":"Batched request timed out"}'
+        except StarletteHTTPException as exc:
+            # Unmatched paths and methods are raised by the router itself
+            headers = list(JSON_HEADERS)
+            headers += [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in (exc.headers or {}).items()]
+            return exc.status_code, headers, orjson.dumps({"detail": exc.detail})
+        except Exception as exc:
+            # Task groups wrap what the response raised in an ExceptionGroup
+            if isinstance(exc, StreamingResponseRejected) or (
+                isinstance(exc, BaseExceptionGroup) and exc.subgroup(StreamingResponseRejected) is not None
+            ):
+                return 400, JSON_HEADERS, b'{"detail":"Streaming responses cannot be batched"}'
+            logger.exception("Batched request to %s failed", item.path)
+            return 500, JSON_HEADERS, b'{"detail":"Internal Server Error"}'
+        finally:
+            if batch_stats is not None:
+                batch_stats.queries += stats.queries
+                batch_stats.db_time += stats.db_time
+    return status_code, headers, b"".join(body)
+
+
+def _encode_item(item: BatchRequestItem, status_code: int, raw_headers: list, body: bytes) -> bytes:
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in raw_headers if name != b"content-length"
+    }
+    if not body:
+        encoded_body = b"null"
+    elif headers.get("content-type", "").startswith("application/json"):
+        # Already JSON: splice it in as is rather than decoding and re-encoding it
+        encoded_body = body
+    else:
+        encoded_body = orjson.dumps(body.decode("utf-8", "replace"))
+    head = orjson.dumps({"id": item.id, "status": status_code, "headers": headers})
+    return head[:-1] + b',"body":' + encoded_body + b"}"
+
+
+@router.post("", response_model=BatchResponse)
+async def batch(
+    batch_request: BatchRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Run several GET requests as the current user and return all their responses.
+
+    Sub-requests run concurrently, each with its own database session: one
+    AsyncSession cannot run statements concurrently.
+    """
+    if len(batch_request.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may hold at most {settings.batch_max_requests} requests"
+        )
+
+    # Detach the principal and give the connection back before fanning out
+    await db.close()
+
+    slots = asyncio.Semaphore(settings.db_pool_size)
+    results = await asyncio.gather(*(
+        _run(request, item, current_user, slots) for item in batch_request.requests
+    ))
+    items = [_encode_item(item, *result) for item, result in zip(batch_request.requests, results)]
+    return Response(content=b'{"responses":[' + b",".join(items) + b"]}", media_type="application/json")
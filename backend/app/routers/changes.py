@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, or_, select
+from typing import Optional
+import orjson
+from ..database import get_read_db
+from ..models.announcement import Announcement
+from ..models.change import Change, ChangeLogState
+from ..models.document import Document
+from ..models.employee import Employee
+from ..models.leave import Leave
+from ..models.user import User, UserRole
+from ..schemas.announcement import AnnouncementResponse
+from ..schemas.change import ChangeFeed
+from ..schemas.document import DocumentResponse
+from ..schemas.employee import EmployeeResponse
+from ..schemas.leave import LeaveResponse
+from ..services.changes import DELETE
+from ..utils.auth import get_current_active_user
+from ..utils.rows import schema_columns
+from ..metrics import TimedRoute
+
+router = APIRouter(prefix="/changes", tags=["Changes"], route_class=TimedRoute)
+
+# Entity name in the change log -> (model, schema its data is rendered with)
+ENTITIES = {
+    model.__tablename__: (model, schema)
+    for model, schema in (
+        (Employee, EmployeeResponse),
+        (Leave, LeaveResponse),
+        (Announcement, AnnouncementResponse),
+        (Document, DocumentResponse),
+    )
+}
+
+
+def _feed(changes: list, next_token: int, has_more: bool) -> Response:
+    return Response(
+        content=orjson.dumps({"changes": changes, "next": next_token, "has_more": has_more}),
+        media_type="application/json"
+    )
+
+
+@router.get("/", response_model=ChangeFeed)
+async def get_changes(
+    since: Optional[int] = Query(
+        None, ge=0,
+        description="Token from a previous response; omit it to get the current token without changes"
+    ),
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Rows created, updated or deleted since ``since``, oldest first.
+
+    Each row appears once with its latest state: ``upsert`` carries the row
+    as the list endpoints render it, ``delete`` is a tombstone. Keep calling
+    with ``next`` until ``has_more`` is false. Clients take a token before
+    loading their lists, so anything changed while loading is replayed.
+    """
+    pruned_through, head = (await db.execute(select(
+        select(ChangeLogState.pruned_through).where(ChangeLogState.id == 1).scalar_subquery(),
+        select(func.max(Change.id)).scalar_subquery()
+    ))).one()
+    head = head or 0
+    if since is None:
+        return _feed([], head, False)
+    if pruned_through is not None and since < pruned_through:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Changes since this token have been pruned; reload and start from a new token"
+        )
+
+    # Bounded by head so that rows committed meanwhile are left for the next call
+    query = (
+        select(Change.id, Change.entity, Change.entity_id, Change.operation)
+        .where(Change.id > since, Change.id <= head)
+        .order_by(Change.id)
+        .limit(limit + 1)
+    )
+    if current_user.role == UserRole.EMPLOYEE:
+        employee_id = await db.scalar(select(Employee.id).where(Employee.user_id == current_user.id))
+        query = query.where(or_(Change.employee_id.is_(None), Change.employee_id == employee_id))
+    rows = (await db.execute(query)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_token = rows[-1].id if has_more else max(since, head)
+
+    # Only the latest change of each row matters
+    latest = {}
+    for row in rows:
+        latest.pop((row.entity, row.entity_id), None)
+        latest[(row.entity, row.entity_id)] = row
+
+    upserted = {}
+    for (entity, entity_id), row in latest.items():
+        if row.operation != DELETE:
+            upserted.setdefault(entity, []).append(entity_id)
+    data = {}
+    for entity, ids in upserted.items():
+        model, schema = ENTITIES[entity]
+        columns = schema_columns(schema, model)
+        names = [column.key for column in columns]
+        for values in await db.execute(select(*columns).where(model.id.in_(ids))):
+            data[entity, values.id] = dict(zip(names, values))
+
+    changes = []
+    for key, row in latest.items():
+        current = data.get(key)
+        # A row deleted after its upsert was logged is reported as deleted
+        changes.append({
+            "token": row.id,
+            "entity": row.entity,
+            "id": row.entity_id,
+            "operation": row.operation if current is not None else DELETE,
+            "data": current,
+        })
+    return _feed(changes, next_token, has_more)
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from ..database import get_db
+from ..models.announcement import Announcement
+from ..models.employee import Employee
+from ..models.leave import Leave
+from ..models.user import User, UserRole
+from ..schemas.dashboard import DashboardSummary
+from ..services import counters
+from ..services.announcements import FEED_ORDER, active_feed, active_filter
+from ..utils.auth import get_current_active_user
+from ..metrics import TimedRoute
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"], route_class=TimedRoute)
+
+RECENT_ANNOUNCEMENTS = 5
+
+
+async def _own_leave_counters(db: AsyncSession, employee_id: int) -> dict:
+    # Employees only ever see their own leaves, so bucket those directly
+    # instead of exposing the company-wide rollups.
+    own = {counters.LEAVES_BY_STATUS: {}, counters.LEAVES_BY_TYPE: {}, counters.LEAVES_BY_MONTH: {}}
+    rows = await db.execute(
+        select(Leave.status, Leave.leave_type, Leave.start_date, func.count())
+        .where(Leave.employee_id == employee_id)
+        .group_by(Leave.status, Leave.leave_type, Leave.start_date)
+    )
+    for leave_status, leave_type, start_date, count in rows:
+        for metric, key in (
+            (counters.LEAVES_BY_STATUS, counters.enum_key(leave_status)),
+            (counters.LEAVES_BY_TYPE, counters.enum_key(leave_type)),
+            (counters.LEAVES_BY_MONTH, counters.month_key(start_date)),
+        ):
+            own[metric][key] = own[metric].get(key, 0) + count
+    return own
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_summary(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    totals = await counters.get_counters(db)
+
+    if current_user.role == UserRole.EMPLOYEE:
+        employee = await db.scalar(select(Employee).where(Employee.user_id == current_user.id))
+        if employee:
+            totals.update(await _own_leave_counters(db, employee.id))
+        else:
+            for metric in (counters.LEAVES_BY_STATUS, counters.LEAVES_BY_TYPE, counters.LEAVES_BY_MONTH):
+                totals[metric] = {}
+
+    feed = await active_feed(db, None)
+    if feed is not None:
+        active_announcements = len(feed.rows)
+        recent_announcements = feed.objects(RECENT_ANNOUNCEMENTS)
+    else:
+        active_announcements = await db.scalar(select(func.count(Announcement.id)).where(active_filter()))
+        recent_announcements = (await db.scalars(
+            select(Announcement)
+            .where(active_filter())
+            .order_by(*(column.desc() for column, _ in FEED_ORDER))
+            .limit(RECENT_ANNOUNCEMENTS)
+        )).all()
+
+    departments = totals.get(counters.EMPLOYEES_BY_DEPARTMENT, {})
+    statuses = totals.get(counters.LEAVES_BY_STATUS, {})
+    categories = totals.get(counters.DOCUMENTS_BY_CATEGORY, {})
+    return {
+        "total_employees": sum(departments.values()),
+        "employees_by_department": departments,
+        "total_leaves": sum(statuses.values()),
+        "leaves_by_status": statuses,
+        "leaves_by_type": totals.get(counters.LEAVES_BY_TYPE, {}),
+        "leaves_by_month": totals.get(counters.LEAVES_BY_MONTH, {}),
+        "total_documents": sum(categories.values()),
+        "documents_by_category": categories,
+        "active_announcements": active_announcements,
+        "recent_announcements": recent_announcements,
+    }
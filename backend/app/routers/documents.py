@@ -1,53 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import os
-import uuid
-import aiofiles
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.document import Document
 from ..models.user import User, UserRole
 from ..schemas.document import DocumentCreate, DocumentResponse
+from ..services import counters
+from ..services import storage
+from ..services.search import apply_search
 from ..utils.auth import get_current_active_user, require_role
+from ..utils.conditional import list_etag, row_etag, set_etag
+from ..utils.downloads import file_download
+from ..utils.pagination import paginate, set_next_cursor
+from ..utils.rows import Projection, projection
+from ..config import get_settings
+from ..metrics import TimedRoute
 
-router = APIRouter(prefix="/documents", tags=["Documents"])
+router = APIRouter(prefix="/documents", tags=["Documents"], route_class=TimedRoute)
 
-UPLOAD_DIR = "uploads"
+settings = get_settings()
+
+UPLOAD_DIR = settings.upload_dir
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
 @router.get("/", response_model=List[DocumentResponse])
-def get_documents(
+async def get_documents(
     category: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    fields: Projection = Depends(projection(DocumentResponse, Document)),
+    etag: str = Depends(list_etag(Document)),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    query = db.query(Document)
+    query = select(*fields.columns)
 
     if category:
-        query = query.filter(Document.category == category)
+        query = query.where(Document.category == category)
 
+    order_by = [(Document.created_at, True), (Document.id, True)]
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Document.name.ilike(search_term)) |
-            (Document.description.ilike(search_term))
-        )
+        query, rank = apply_search(query, Document, search, db.get_bind().dialect.name)
+        if rank is not None:
+            order_by = [(rank, False), (Document.id, False)]
 
-    return query.order_by(Document.created_at.desc()).offset(skip).limit(limit).all()
+    documents, next_cursor = await paginate(db, query, order_by, cursor, skip, limit)
+    response = fields.response(documents)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
+    return response
 
 
 @router.get("/{document_id}", response_model=DocumentResponse)
-def get_document(
+async def get_document(
     document_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    etag: Optional[str] = Depends(row_etag(Document, "document_id")),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    document = db.query(Document).filter(Document.id == document_id).first()
+    set_etag(response, etag)
+    document = await db.get(Document, document_id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -57,12 +75,13 @@ def get_document(
 
 
 @router.get("/{document_id}/download")
-def download_document(
+async def download_document(
     document_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    document = db.query(Document).filter(Document.id == document_id).first()
+    document = await db.get(Document, document_id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,50 +94,65 @@ def download_document(
             detail="File not found on server"
         )
 
-    return FileResponse(
-        path=document.file_path,
+    return file_download(
+        request,
+        document.file_path,
         filename=document.name,
-        media_type="application/octet-stream"
+        media_type=document.content_type or storage.DEFAULT_CONTENT_TYPE,
+        content_hash=document.content_hash,
+        last_modified=document.created_at
     )
 
 
-@router.post("/upload", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/upload",
+    response_model=DocumentResponse,
+    status_code=status.HTTP_201_CREATED,
+    # The body is parsed by the handler as it arrives; describe it for /docs
+    openapi_extra={"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+        "type": "object",
+        "properties": {"file": {"type": "string", "format": "binary"}},
+        "required": ["file"],
+    }}}}}
+)
 async def upload_document(
-    file: UploadFile = File(...),
+    request: Request,
     name: Optional[str] = None,
     description: Optional[str] = None,
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-    async with aiofiles.open(file_path, 'wb') as out_file:
-        content = await file.read()
-        await out_file.write(content)
+    uploaded_by = current_user.id
+    # No connection is needed while the body arrives, which can take minutes
+    await db.rollback()
+    stored = await storage.receive_upload(request)
+    file_path = await storage.store_blob(db, stored)
 
     new_document = Document(
-        name=name or file.filename,
+        name=name or stored.filename,
         description=description,
         file_path=file_path,
+        file_size=stored.size,
+        content_hash=stored.content_hash,
+        content_type=stored.content_type,
         category=category,
-        uploaded_by=current_user.id
+        uploaded_by=uploaded_by
     )
     db.add(new_document)
-    db.commit()
-    db.refresh(new_document)
+    await counters.track_document(db, new_document)
+    await db.commit()
+    await db.refresh(new_document)
     return new_document
 
 
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_document(
+async def delete_document(
     document_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    document = db.query(Document).filter(Document.id == document_id).first()
+    document = await db.get(Document, document_id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -131,9 +165,14 @@ def delete_document(
             detail="Not authorized to delete this document"
         )
 
-    if os.path.exists(document.file_path):
-        os.remove(document.file_path)
-
-    db.delete(document)
-    db.commit()
+    unused_path = await storage.release_blob(db, document)
+    await counters.track_document(db, document, -1)
+    await db.delete(document)
+    trash_path = storage.trash_file(unused_path)
+    try:
+        await db.commit()
+    except BaseException:
+        storage.restore_file(trash_path, unused_path)
+        raise
+    storage.remove_file(trash_path)
     return None
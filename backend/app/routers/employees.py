@@ -1,47 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.employee import Employee
 from ..models.user import User, UserRole
 from ..schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeResponse
+from ..services import counters
+from ..services.search import apply_search
 from ..utils.auth import get_current_active_user, require_role
+from ..utils.conditional import list_etag, row_etag, set_etag
+from ..utils.pagination import paginate, set_next_cursor
+from ..utils.rows import Projection, projection
+from ..metrics import TimedRoute
 
-router = APIRouter(prefix="/employees", tags=["Employees"])
+router = APIRouter(prefix="/employees", tags=["Employees"], route_class=TimedRoute)
 
 
 @router.get("/", response_model=List[EmployeeResponse])
-def get_employees(
+async def get_employees(
     department: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    fields: Projection = Depends(projection(EmployeeResponse, Employee)),
+    etag: str = Depends(list_etag(Employee)),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    query = db.query(Employee)
+    query = select(*fields.columns)
 
     if department:
-        query = query.filter(Employee.department == department)
+        query = query.where(Employee.department == department)
 
+    order_by = [(Employee.id, False)]
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Employee.first_name.ilike(search_term)) |
-            (Employee.last_name.ilike(search_term)) |
-            (Employee.email.ilike(search_term))
-        )
+        query, rank = apply_search(query, Employee, search, db.get_bind().dialect.name)
+        if rank is not None:
+            order_by.insert(0, (rank, False))
 
-    return query.offset(skip).limit(limit).all()
+    employees, next_cursor = await paginate(db, query, order_by, cursor, skip, limit)
+    response = fields.response(employees)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
+    return response
 
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
-def get_employee(
+async def get_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    etag: Optional[str] = Depends(row_etag(Employee, "employee_id")),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    set_etag(response, etag)
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,9 +66,9 @@ def get_employee(
 
 
 @router.post("/", response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
-def create_employee(
+async def create_employee(
     employee_data: EmployeeCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.ADMIN]))
 ):
     new_employee = Employee(
@@ -61,19 +76,20 @@ def create_employee(
         **employee_data.model_dump()
     )
     db.add(new_employee)
-    db.commit()
-    db.refresh(new_employee)
+    await counters.track_employee(db, new_employee)
+    await db.commit()
+    await db.refresh(new_employee)
     return new_employee
 
 
 @router.put("/{employee_id}", response_model=EmployeeResponse)
-def update_employee(
+async def update_employee(
     employee_id: int,
     employee_data: EmployeeUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -87,27 +103,32 @@ def update_employee(
         )
 
     update_data = employee_data.model_dump(exclude_unset=True)
+    if "department" in update_data and update_data["department"] != employee.department:
+        await counters.track_employee(db, employee, -1)
+        employee.department = update_data["department"]
+        await counters.track_employee(db, employee)
     for field, value in update_data.items():
         setattr(employee, field, value)
 
-    db.commit()
-    db.refresh(employee)
+    await db.commit()
+    await db.refresh(employee)
     return employee
 
 
 @router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_employee(
+async def delete_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.ADMIN]))
 ):
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Employee not found"
         )
 
-    db.delete(employee)
-    db.commit()
+    await counters.track_employee(db, employee, -1)
+    await db.delete(employee)
+    await db.commit()
     return None
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import get_settings
+from ..database import get_db
+from ..models.employee import Employee
+from ..models.user import User, UserRole
+from ..schemas.user import StreamTicket
+from ..services.events import CLOSE, event_broker
+from ..utils.auth import StreamSession, create_stream_ticket, get_current_active_user, get_stream_session, oauth2_scheme
+from ..metrics import TimedRoute
+
+router = APIRouter(prefix="/events", tags=["Events"], route_class=TimedRoute)
+settings = get_settings()
+
+# How long EventSource waits before reconnecting, in milliseconds
+RETRY = b"retry: 5000\n\n"
+
+
+@router.post("/ticket", response_model=StreamTicket)
+async def create_ticket(
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_active_user)
+):
+    """A single-use ticket for opening one ``GET /events/?ticket=`` stream.
+
+    EventSource cannot send an Authorization header, and an access token in
+    the query string would be written to access logs. The ticket is spent
+    by the stream it opens and expires after ``EVENT_TICKET_TTL_SECONDS``.
+    """
+    return {"ticket": create_stream_ticket(token), "expires_in": int(settings.event_ticket_ttl_seconds)}
+
+
+@router.get("/")
+async def stream_events(
+    db: AsyncSession = Depends(get_db),
+    session: StreamSession = Depends(get_stream_session)
+):
+    """Server-sent events for new announcements and processed leave requests.
+
+    ``announcement`` events go to everyone. ``leave`` events go to admins,
+    managers and the employee who requested the leave. Both carry the row as
+    the list endpoints render it. Browsers open the stream with a ticket from
+    ``POST /events/ticket``, since EventSource cannot send an Authorization
+    header. The stream ends when the access token it was opened with
+    expires; the client then opens a new one with a fresh ticket.
+    """
+    current_user = session.user
+    employee_id = None
+    if current_user.role == UserRole.EMPLOYEE:
+        employee_id = await db.scalar(select(Employee.id).where(Employee.user_id == current_user.id))
+    role = current_user.role
+    # A stream may stay open for hours: do not hold a connection meanwhile
+    await db.close()
+
+    event_broker.admit()
+
+    async def frames():
+        # Subscribed here, not in the handler: a response cancelled before
+        # its body starts never runs this generator, nor its finally
+        subscriber = event_broker.subscribe(role, employee_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + session.expires_at - time.time()
+        try:
+            yield RETRY
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    # The token expired: stop sending what it no longer grants
+                    return
+                if frame is CLOSE:
+                    return
+                yield frame
+        finally:
+            event_broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
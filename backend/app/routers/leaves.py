@@ -1,46 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.leave import Leave, LeaveStatus
 from ..models.employee import Employee
 from ..models.user import User, UserRole
 from ..schemas.leave import LeaveCreate, LeaveUpdate, LeaveResponse
+from ..services import counters
+from ..services.events import event_broker
 from ..utils.auth import get_current_active_user, require_role
+from ..utils.conditional import list_etag, row_etag, set_etag, table_version
+from ..utils.pagination import paginate, set_next_cursor
+from ..utils.rows import Projection, projection
+from ..metrics import TimedRoute
 
-router = APIRouter(prefix="/leaves", tags=["Leaves"])
+router = APIRouter(prefix="/leaves", tags=["Leaves"], route_class=TimedRoute)
+
+
+def _employees_version():
+    # Employees are shown their own leaves, found through their profile
+    return table_version(Employee.__tablename__)
 
 
 @router.get("/", response_model=List[LeaveResponse])
-def get_leaves(
+async def get_leaves(
     status_filter: Optional[LeaveStatus] = Query(None, alias="status"),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    fields: Projection = Depends(projection(LeaveResponse, Leave)),
+    etag: str = Depends(list_etag(Leave, extra=_employees_version)),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    query = db.query(Leave)
+    query = select(*fields.columns)
 
     if current_user.role == UserRole.EMPLOYEE:
-        employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+        employee = await db.scalar(select(Employee).where(Employee.user_id == current_user.id))
         if employee:
-            query = query.filter(Leave.employee_id == employee.id)
+            query = query.where(Leave.employee_id == employee.id)
         else:
-            return []
+            response = fields.response([])
+            set_etag(response, etag)
+            return response
 
     if status_filter:
-        query = query.filter(Leave.status == status_filter)
+        query = query.where(Leave.status == status_filter)
 
-    return query.order_by(Leave.created_at.desc()).offset(skip).limit(limit).all()
+    leaves, next_cursor = await paginate(
+        db, query, [(Leave.created_at, True), (Leave.id, True)], cursor, skip, limit
+    )
+    response = fields.response(leaves)
+    set_next_cursor(response, next_cursor)
+    set_etag(response, etag)
+    return response
 
 
 @router.get("/{leave_id}", response_model=LeaveResponse)
-def get_leave(
+async def get_leave(
     leave_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    etag: Optional[str] = Depends(row_etag(Leave, "leave_id")),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    leave = db.query(Leave).filter(Leave.id == leave_id).first()
+    set_etag(response, etag)
+    leave = await db.get(Leave, leave_id)
     if not leave:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,7 +74,7 @@ def get_leave(
         )
 
     if current_user.role == UserRole.EMPLOYEE:
-        employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+        employee = await db.scalar(select(Employee).where(Employee.user_id == current_user.id))
         if not employee or leave.employee_id != employee.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -59,12 +85,12 @@ def get_leave(
 
 
 @router.post("/", response_model=LeaveResponse, status_code=status.HTTP_201_CREATED)
-def create_leave(
+async def create_leave(
     leave_data: LeaveCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = await db.scalar(select(Employee).where(Employee.user_id == current_user.id))
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -82,19 +108,21 @@ def create_leave(
         **leave_data.model_dump()
     )
     db.add(new_leave)
-    db.commit()
-    db.refresh(new_leave)
+    await db.flush()
+    await counters.track_leave(db, new_leave)
+    await db.commit()
+    await db.refresh(new_leave)
     return new_leave
 
 
 @router.put("/{leave_id}/approve", response_model=LeaveResponse)
-def approve_leave(
+async def approve_leave(
     leave_id: int,
     leave_update: LeaveUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.MANAGER]))
 ):
-    leave = db.query(Leave).filter(Leave.id == leave_id).first()
+    leave = await db.get(Leave, leave_id)
     if not leave:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -107,31 +135,34 @@ def approve_leave(
             detail="Leave request has already been processed"
         )
 
-    approver = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    approver = await db.scalar(select(Employee).where(Employee.user_id == current_user.id))
 
+    await counters.increment(db, counters.LEAVES_BY_STATUS, counters.enum_key(leave.status), -1)
+    await counters.increment(db, counters.LEAVES_BY_STATUS, counters.enum_key(leave_update.status))
     leave.status = leave_update.status
     if approver:
         leave.approved_by = approver.id
 
-    db.commit()
-    db.refresh(leave)
+    await db.commit()
+    await db.refresh(leave)
+    await event_broker.publish_leave(LeaveResponse.model_validate(leave).model_dump(mode="json"))
     return leave
 
 
 @router.delete("/{leave_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_leave(
+async def delete_leave(
     leave_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    leave = db.query(Leave).filter(Leave.id == leave_id).first()
+    leave = await db.get(Leave, leave_id)
     if not leave:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Leave request not found"
         )
 
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
+    employee = await db.scalar(select(Employee).where(Employee.user_id == current_user.id))
     if current_user.role == UserRole.EMPLOYEE:
         if not employee or leave.employee_id != employee.id:
             raise HTTPException(
@@ -144,6 +175,7 @@ def delete_leave(
                 detail="Cannot delete a processed leave request"
             )
 
-    db.delete(leave)
-    db.commit()
+    await counters.track_leave(db, leave, -1)
+    await db.delete(leave)
+    await db.commit()
     return None
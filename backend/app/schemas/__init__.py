@@ -1,13 +1,19 @@
-from .user import UserCreate, UserResponse, UserLogin, Token, TokenData
+from .user import UserCreate, UserResponse, UserLogin, Token, StreamTicket, TokenData
 from .employee import EmployeeCreate, EmployeeUpdate, EmployeeResponse
 from .leave import LeaveCreate, LeaveUpdate, LeaveResponse
 from .announcement import AnnouncementCreate, AnnouncementResponse
 from .document import DocumentCreate, DocumentResponse
+from .dashboard import DashboardSummary
+from .batch import BatchRequest, BatchResponse
+from .change import ChangeFeed
 
 __all__ = [
-    "UserCreate", "UserResponse", "UserLogin", "Token", "TokenData",
+    "UserCreate", "UserResponse", "UserLogin", "Token", "StreamTicket", "TokenData",
     "EmployeeCreate", "EmployeeUpdate", "EmployeeResponse",
     "LeaveCreate", "LeaveUpdate", "LeaveResponse",
     "AnnouncementCreate", "AnnouncementResponse",
-    "DocumentCreate", "DocumentResponse"
+    "DocumentCreate", "DocumentResponse",
+    "DashboardSummary",
+    "BatchRequest", "BatchResponse",
+    "ChangeFeed"
 ]
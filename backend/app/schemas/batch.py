@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class BatchRequestItem(BaseModel):
+    id: Optional[str] = None
+    path: str = Field(..., pattern=r"^/", description="Path and query string of a GET request, e.g. /leaves/?limit=20")
+    headers: Dict[str, str] = {}
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., min_length=1)
+
+
+class BatchResponseItem(BaseModel):
+    id: Optional[str]
+    status: int
+    headers: Dict[str, str]
+    body: Any
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResponseItem]
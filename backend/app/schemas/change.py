@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+
+class ChangeEntry(BaseModel):
+    token: int
+    entity: str
+    id: int
+    operation: str
+    data: Optional[Dict[str, Any]] = None
+
+
+class ChangeFeed(BaseModel):
+    changes: List[ChangeEntry]
+    next: int
+    has_more: bool
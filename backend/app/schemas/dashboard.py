@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from .announcement import AnnouncementResponse
+
+
+class DashboardSummary(BaseModel):
+    total_employees: int
+    employees_by_department: Dict[str, int]
+    total_leaves: int
+    leaves_by_status: Dict[str, int]
+    leaves_by_type: Dict[str, int]
+    leaves_by_month: Dict[str, int]
+    total_documents: int
+    documents_by_category: Dict[str, int]
+    active_announcements: int
+    recent_announcements: List[AnnouncementResponse]
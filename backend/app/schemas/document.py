@@ -14,6 +14,9 @@ class DocumentResponse(BaseModel):
     name: str
     description: Optional[str]
     file_path: str
+    file_size: Optional[int] = None
+    content_hash: Optional[str] = None
+    content_type: Optional[str] = None
     category: Optional[str]
     uploaded_by: int
     created_at: datetime
@@ -32,6 +32,11 @@ class Token(BaseModel):
     token_type: str
 
 
+class StreamTicket(BaseModel):
+    ticket: str
+    expires_in: int
+
+
 class TokenData(BaseModel):
     email: Optional[str] = None
     role: Optional[str] = None
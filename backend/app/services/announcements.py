@@ -0,0 +1,118 @@
+"""In-process cache of the active announcement feed.
+
+Every page load reads the same few active announcements. The whole active
+feed of each priority filter is cached as response rows, and lists and the
+dashboard are cut from it. An entry lives until the next announcement in
+it expires, so expired posts never show and the database is not asked in
+between. Announcement writes clear it in every worker through the
+invalidation bus. It is always filled from the primary: a replica that
+has not caught up with the write would otherwise put the stale feed back
+for every reader until the entry expires.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+from ..models.announcement import Announcement, Priority
+from ..schemas.announcement import AnnouncementResponse
+from ..utils.cache import TTLCache
+from ..utils.pagination import keyset_columns, paginate_rows
+from ..utils.rows import schema_columns
+from .invalidation import ANNOUNCEMENTS, invalidation_bus
+
+settings = get_settings()
+
+FEED_ORDER = [(Announcement.created_at, True), (Announcement.id, True)]
+
+feed_cache = TTLCache(maxsize=len(Priority) + 1, ttl=settings.announcement_feed_ttl_seconds)
+
+
+def active_filter():
+    return or_(
+        Announcement.expires_at.is_(None),
+        Announcement.expires_at > datetime.utcnow()
+    )
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # SQLite hands back naive UTC datetimes, Postgres aware ones
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class Feed:
+    """Active announcements of one priority filter, newest first."""
+
+    __slots__ = ("columns", "rows", "keys", "order_by")
+
+    def __init__(self, columns: List[Any], rows: List[tuple], keys: List[tuple], order_by):
+        self.columns = columns
+        self.rows = rows
+        self.keys = keys
+        self.order_by = order_by
+
+    def page(self, columns: Sequence[Any], cursor: Optional[str], skip: int, limit: int) -> Tuple[list, Optional[str]]:
+        """Rows of ``columns`` for one page, with the cursor of the next."""
+        rows, next_cursor = paginate_rows(self.rows, self.keys, self.order_by, cursor, skip, limit)
+        names = [column.key for column in self.columns]
+        positions = [names.index(column.key) for column in columns]
+        return [tuple(row[i] for i in positions) for row in rows], next_cursor
+
+    def objects(self, limit: int) -> List[dict]:
+        names = [column.key for column in self.columns]
+        return [dict(zip(names, row)) for row in self.rows[:limit]]
+
+
+async def active_feed(db: AsyncSession, priority: Optional[Priority]) -> Optional[Feed]:
+    """The cached active feed for ``priority``, loading it on a miss.
+
+    Returns None when the feed is too large to cache; callers then query
+    the database themselves. Misses on a session pinned to a replica are
+    loaded through a short session on the primary instead.
+    """
+    feed = feed_cache.get(priority)
+    if feed is not None:
+        return feed
+
+    generation = feed_cache.generation
+    if db.info.get("replica") is not None:
+        async with AsyncSessionLocal() as primary:
+            return await _load_feed(primary, priority, generation)
+    return await _load_feed(db, priority, generation)
+
+
+async def _load_feed(db: AsyncSession, priority: Optional[Priority], generation: int) -> Optional[Feed]:
+    columns = schema_columns(AnnouncementResponse, Announcement)
+    order_by = keyset_columns(db, FEED_ORDER)
+    query = (
+        select(*columns, *(column.label(f"_cursor_{i}") for i, (column, _) in enumerate(order_by)))
+        .where(active_filter())
+        .order_by(*(column.desc() if descending else column.asc() for column, descending in order_by))
+        .limit(settings.announcement_feed_max_rows + 1)
+    )
+    if priority:
+        query = query.where(Announcement.priority == priority)
+    result = (await db.execute(query)).all()
+    if len(result) > settings.announcement_feed_max_rows:
+        return None
+
+    width = len(columns)
+    feed = Feed(columns, [row[:width] for row in result], [row[width:] for row in result], order_by)
+
+    ttl = settings.announcement_feed_ttl_seconds
+    expires = [_naive_utc(row.expires_at) for row in result if row.expires_at is not None]
+    if expires:
+        ttl = min(ttl, (min(expires) - datetime.utcnow()).total_seconds())
+    feed_cache.set(priority, feed, ttl=ttl, generation=generation)
+    return feed
+
+
+def invalidate_feed(announcement_id: Optional[int] = None) -> None:
+    feed_cache.clear()
+
+
+invalidation_bus.subscribe(ANNOUNCEMENTS, invalidate_feed)
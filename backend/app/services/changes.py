@@ -0,0 +1,112 @@
+"""Change log behind ``GET /changes``.
+
+Every flush that creates, updates or deletes a synced row appends one
+``Change`` per row in the same transaction, so the log commits (or rolls
+back) together with the data. Deletes are kept as tombstones.
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import delete, event, func, insert, select, text
+from sqlalchemy.orm import Session
+from ..config import get_settings
+from ..models.announcement import Announcement
+from ..models.change import Change, ChangeLogState
+from ..models.document import Document
+from ..models.employee import Employee
+from ..models.leave import Leave
+
+settings = get_settings()
+
+UPSERT = "upsert"
+DELETE = "delete"
+# Logged by reset_change_log as every table's new version; never served
+RESET = "reset"
+
+# Synced models, with the attribute naming the employee a row is private to
+TRACKED = {
+    Employee: None,
+    Leave: "employee_id",
+    Announcement: None,
+    Document: None,
+}
+
+# Key of the Postgres advisory lock that keeps change ids in commit order
+CHANGE_LOG_LOCK = 0x6368616e6765
+
+
+def _change(instance, operation: str) -> dict:
+    owner = TRACKED[type(instance)]
+    return {
+        "entity": instance.__tablename__,
+        "entity_id": instance.id,
+        "operation": operation,
+        "employee_id": getattr(instance, owner) if owner else None,
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def record_changes(session, flush_context):
+    rows = [_change(instance, UPSERT) for instance in session.new if type(instance) in TRACKED]
+    rows += [
+        _change(instance, UPSERT) for instance in session.dirty
+        if type(instance) in TRACKED and session.is_modified(instance, include_collections=False)
+    ]
+    rows += [_change(instance, DELETE) for instance in session.deleted if type(instance) in TRACKED]
+    if not rows:
+        return
+
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        # Sequence values are handed out at insert time but become visible at
+        # commit; holding this lock until commit stops a reader from seeing
+        # id N+1 before N and skipping N forever. SQLite writers are already
+        # serialized.
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK})
+    connection.execute(insert(Change), rows)
+
+
+def prune_changes(db: Session) -> None:
+    """Drop changes older than the retention period.
+
+    The newest change of each table is always kept: it is that table's
+    version, which list ETags are built from. ``ChangeLogState`` records the
+    newest id pruned, which is what ``since`` tokens are checked against.
+    """
+    if not settings.change_log_retention_days:
+        return
+    cutoff = datetime.utcnow() - timedelta(days=settings.change_log_retention_days)
+    # Ids follow commit order: everything up to the newest expired id goes
+    expired = db.scalar(select(func.max(Change.id)).where(Change.created_at < cutoff))
+    if expired is None:
+        return
+    db.execute(
+        delete(Change)
+        .where(Change.id <= expired)
+        .where(Change.id.not_in(select(func.max(Change.id)).group_by(Change.entity)))
+    )
+    state = db.get(ChangeLogState, 1)
+    if state is None:
+        db.add(ChangeLogState(id=1, pruned_through=expired))
+    else:
+        state.pruned_through = max(state.pruned_through, expired)
+    db.commit()
+
+
+def reset_change_log(db: Session) -> None:
+    """Start the change log over once every synced row has been replaced.
+
+    Logs one ``RESET`` per table, so list versions move past any ETag a
+    client holds, and marks everything before as pruned, so older ``since``
+    tokens get a 410 and reload instead of being told nothing changed.
+    """
+    db.execute(delete(Change))
+    db.execute(insert(Change), [
+        {"entity": model.__tablename__, "entity_id": 0, "operation": RESET} for model in TRACKED
+    ])
+    head = db.scalar(select(func.max(Change.id)))
+    state = db.get(ChangeLogState, 1)
+    if state is None:
+        db.add(ChangeLogState(id=1, pruned_through=head))
+    else:
+        state.pruned_through = head
+    db.commit()
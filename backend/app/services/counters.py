@@ -0,0 +1,101 @@
+from typing import Dict
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..models.counter import Counter
+from ..models.employee import Employee
+from ..models.leave import Leave
+from ..models.document import Document
+
+EMPLOYEES_BY_DEPARTMENT = "employees_by_department"
+LEAVES_BY_STATUS = "leaves_by_status"
+LEAVES_BY_TYPE = "leaves_by_type"
+LEAVES_BY_MONTH = "leaves_by_month"
+DOCUMENTS_BY_CATEGORY = "documents_by_category"
+
+UNKNOWN_DEPARTMENT = "Unknown"
+UNCATEGORIZED = "Uncategorized"
+
+
+async def increment(db: AsyncSession, metric: str, key: str, delta: int = 1) -> None:
+    """Adjust a counter inside the caller's transaction."""
+    result = await db.execute(
+        update(Counter)
+        .where(Counter.metric == metric, Counter.key == key)
+        .values(value=Counter.value + delta)
+    )
+    if result.rowcount == 0:
+        db.add(Counter(metric=metric, key=key, value=delta))
+        await db.flush()
+
+
+def department_key(department) -> str:
+    return department or UNKNOWN_DEPARTMENT
+
+
+def category_key(category) -> str:
+    return category or UNCATEGORIZED
+
+
+def month_key(day) -> str:
+    return day.strftime("%Y-%m")
+
+
+def enum_key(value) -> str:
+    return getattr(value, "value", value)
+
+
+async def track_employee(db: AsyncSession, employee: Employee, delta: int = 1) -> None:
+    await increment(db, EMPLOYEES_BY_DEPARTMENT, department_key(employee.department), delta)
+
+
+async def track_leave(db: AsyncSession, leave: Leave, delta: int = 1) -> None:
+    await increment(db, LEAVES_BY_STATUS, enum_key(leave.status), delta)
+    await increment(db, LEAVES_BY_TYPE, enum_key(leave.leave_type), delta)
+    await increment(db, LEAVES_BY_MONTH, month_key(leave.start_date), delta)
+
+
+async def track_document(db: AsyncSession, document: Document, delta: int = 1) -> None:
+    await increment(db, DOCUMENTS_BY_CATEGORY, category_key(document.category), delta)
+
+
+async def get_counters(db: AsyncSession) -> Dict[str, Dict[str, int]]:
+    counters: Dict[str, Dict[str, int]] = {}
+    result = await db.execute(select(Counter.metric, Counter.key, Counter.value))
+    for metric, key, value in result:
+        if value:
+            counters.setdefault(metric, {})[key] = value
+    return counters
+
+
+def rebuild_counters(db: Session) -> None:
+    """Recompute every counter from the source tables."""
+    db.query(Counter).delete()
+
+    rows = []
+    for department, count in db.query(Employee.department, func.count()).group_by(Employee.department):
+        rows.append((EMPLOYEES_BY_DEPARTMENT, department_key(department), count))
+    for leave_status, count in db.query(Leave.status, func.count()).group_by(Leave.status):
+        rows.append((LEAVES_BY_STATUS, enum_key(leave_status), count))
+    for leave_type, count in db.query(Leave.leave_type, func.count()).group_by(Leave.leave_type):
+        rows.append((LEAVES_BY_TYPE, enum_key(leave_type), count))
+    for category, count in db.query(Document.category, func.count()).group_by(Document.category):
+        rows.append((DOCUMENTS_BY_CATEGORY, category_key(category), count))
+
+    months: Dict[str, int] = {}
+    for start_date, count in db.query(Leave.start_date, func.count()).group_by(Leave.start_date):
+        months[month_key(start_date)] = months.get(month_key(start_date), 0) + count
+    rows.extend((LEAVES_BY_MONTH, key, count) for key, count in months.items())
+
+    merged: Dict[tuple, int] = {}
+    for metric, key, count in rows:
+        merged[(metric, key)] = merged.get((metric, key), 0) + count
+
+    db.add_all(Counter(metric=metric, key=key, value=value) for (metric, key), value in merged.items())
+    db.commit()
+
+
+def ensure_counters(db: Session) -> None:
+    """Build the counters on first start against a database that predates them."""
+    if db.query(Counter).first() is None:
+        rebuild_counters(db)
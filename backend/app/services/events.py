@@ -0,0 +1,156 @@
+"""Server-sent event fan-out for ``GET /events``.
+
+Handlers publish an event once on the invalidation bus, so streams open on
+any worker get it. Each worker encodes it to a single SSE frame and hands
+that to every interested subscriber. Subscribers are indexed by who may see
+what, so a leave update only reaches its owner and the managers instead of
+being filtered per connection.
+
+Each subscriber has a bounded queue. A client that stops reading fills it
+and is dropped rather than buffering without limit; EventSource reconnects
+on its own. One heartbeat task per worker keeps idle connections open
+through proxies.
+"""
+
+import asyncio
+from typing import Dict, Optional, Set
+import orjson
+from fastapi import HTTPException, status
+from ..config import get_settings
+from ..models.user import UserRole
+from .invalidation import EVENTS, invalidation_bus
+
+settings = get_settings()
+
+ANNOUNCEMENT = "announcement"
+LEAVE = "leave"
+
+HEARTBEAT = b": heartbeat\n\n"
+# Queued to tell a subscriber's stream to end
+CLOSE = None
+
+# Roles that see every employee's leave requests
+LEAVE_MANAGERS = {UserRole.ADMIN, UserRole.MANAGER}
+
+
+def encode_event(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+class Subscriber:
+    __slots__ = ("role", "employee_id", "queue")
+
+    def __init__(self, role: UserRole, employee_id: Optional[int], queue_size: int):
+        self.role = role
+        self.employee_id = employee_id
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=queue_size)
+
+
+class EventBroker:
+    """Per-worker registry of event stream subscribers."""
+
+    def __init__(self, queue_size: int, max_subscribers: int, heartbeat_seconds: float):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat_seconds = heartbeat_seconds
+        self.published = 0
+        self.dropped = 0
+        self.rejected = 0
+        self._everyone: Set[Subscriber] = set()
+        self._managers: Set[Subscriber] = set()
+        self._by_employee: Dict[int, Set[Subscriber]] = {}
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def admit(self) -> None:
+        """Turn a new stream away with 503 when this worker is full."""
+        if len(self._everyone) >= self.max_subscribers:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many open event streams, please retry",
+                headers={"Retry-After": "5"},
+            )
+
+    def subscribe(self, role: UserRole, employee_id: Optional[int]) -> Subscriber:
+        subscriber = Subscriber(role, employee_id, self.queue_size)
+        self._everyone.add(subscriber)
+        if role in LEAVE_MANAGERS:
+            self._managers.add(subscriber)
+        if employee_id is not None:
+            self._by_employee.setdefault(employee_id, set()).add(subscriber)
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._everyone.discard(subscriber)
+        self._managers.discard(subscriber)
+        if subscriber.employee_id is not None:
+            own = self._by_employee.get(subscriber.employee_id)
+            if own is not None:
+                own.discard(subscriber)
+                if not own:
+                    del self._by_employee[subscriber.employee_id]
+
+    def _end(self, subscriber: Subscriber) -> None:
+        self.unsubscribe(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(CLOSE)
+
+    def _deliver(self, frame: bytes, subscribers) -> None:
+        for subscriber in list(subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Too far behind: end its stream instead of buffering more
+                self.dropped += 1
+                self._end(subscriber)
+
+    def close(self) -> None:
+        """End every open stream, so that shutdown does not wait on them."""
+        for subscriber in list(self._everyone):
+            self._end(subscriber)
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+
+    async def publish_announcement(self, announcement: dict) -> None:
+        await invalidation_bus.publish(EVENTS, [ANNOUNCEMENT, announcement])
+
+    async def publish_leave(self, leave: dict) -> None:
+        await invalidation_bus.publish(EVENTS, [LEAVE, leave])
+
+    def dispatch(self, message: list) -> None:
+        """Push an event from the bus to this worker's subscribers."""
+        event, data = message
+        self.published += 1
+        if event == ANNOUNCEMENT:
+            subscribers = self._everyone
+        elif event == LEAVE:
+            subscribers = self._managers | self._by_employee.get(data["employee_id"], set())
+        else:
+            return
+        if subscribers:
+            self._deliver(encode_event(event, data), subscribers)
+
+    async def _beat(self) -> None:
+        while self._everyone:
+            await asyncio.sleep(self.heartbeat_seconds)
+            self._deliver(HEARTBEAT, self._everyone)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._everyone),
+            "max_subscribers": self.max_subscribers,
+            "published": self.published,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+
+event_broker = EventBroker(
+    queue_size=settings.event_queue_size,
+    max_subscribers=settings.event_max_subscribers,
+    heartbeat_seconds=settings.event_heartbeat_seconds
+)
+invalidation_bus.subscribe(EVENTS, event_broker.dispatch)
@@ -0,0 +1,256 @@
+"""Cache invalidation shared by every worker.
+
+Workers keep in-process caches (principals, the announcement feed) and
+push ``/events`` to their own clients only. Mutating handlers publish what
+they changed on this bus once they have committed. Every worker, the
+publisher included, then runs the handlers subscribed to that topic.
+
+``INVALIDATION_BUS_URL`` picks the backend:
+
+* ``sqlite:///path`` (default) appends messages to a small SQLite file that
+  every worker on the host polls.
+* ``redis://host:port/db`` uses Redis pub/sub, or any server that speaks
+  its protocol; needs ``pip install redis``. Messages sent while a worker
+  is disconnected are lost, so its caches only catch up by expiring.
+* ``memory://`` only reaches the current process, for a single worker.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+import orjson
+from sqlalchemy.engine import make_url
+from ..config import get_settings
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Topics, with the payload each carries. Each has a subscriber; a topic no
+# worker consumes would only add bus traffic.
+USERS = "users"                  # email of the user
+ANNOUNCEMENTS = "announcements"  # announcement id
+EVENTS = "events"                # [event type, data] for /events streams
+STREAM_TICKETS = "stream_tickets"  # id of a redeemed /events ticket
+
+REDIS_CHANNEL = "employee_hub.invalidation"
+
+Handler = Callable[[Any], None]
+
+
+class InvalidationBus:
+    """Dispatches to this process only; the base of the shared backends."""
+
+    backend = "memory"
+
+    def __init__(self):
+        # Tells this worker's own messages apart when they come back
+        self.origin = uuid.uuid4().hex
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+        self._handlers: Dict[str, List[Handler]] = {}
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        self._handlers.setdefault(topic, []).append(handler)
+
+    async def publish(self, topic: str, payload: Any = None) -> None:
+        """Run the local handlers now and tell the other workers.
+
+        Call it after committing, or another worker may reload the old data
+        before the write is visible.
+        """
+        self.published += 1
+        self._dispatch(topic, payload)
+        try:
+            await self._send(topic, payload)
+        except Exception:
+            # The write is committed: the other workers catch up when their entries expire
+            self.errors += 1
+            logger.exception("Could not publish %s invalidation", topic)
+
+    def _dispatch(self, topic: str, payload: Any) -> None:
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(payload)
+            except Exception:
+                self.errors += 1
+                logger.exception("Invalidation handler for %s failed", topic)
+
+    def _receive(self, origin: str, topic: str, payload: Any) -> None:
+        if origin != self.origin:
+            self.received += 1
+            self._dispatch(topic, payload)
+
+    async def _send(self, topic: str, payload: Any) -> None:
+        pass
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
+
+
+class SQLiteBus(InvalidationBus):
+    """Messages appended to a SQLite file that each worker polls for new rows."""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, poll_interval: float, retention: float):
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_id: Optional[int] = None
+        self._next_prune = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Messages are worthless after a crash: caches start empty anyway
+            connection.execute("PRAGMA synchronous=OFF")
+            # AUTOINCREMENT: ids are never reused after old messages are pruned
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL, topic TEXT NOT NULL, "
+                "payload BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _insert(self, topic: str, payload: Any) -> None:
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO messages (origin, topic, payload, created_at) VALUES (?, ?, ?, ?)",
+                (self.origin, topic, orjson.dumps(payload), time.time())
+            )
+
+    def _fetch(self) -> list:
+        with self._lock:
+            connection = self._connect()
+            if self._last_id is None:
+                # Start from the tail: older messages concern caches this worker never filled
+                self._last_id = connection.execute("SELECT coalesce(max(id), 0) FROM messages").fetchone()[0]
+            rows = connection.execute(
+                "SELECT id, origin, topic, payload FROM messages WHERE id > ? ORDER BY id", (self._last_id,)
+            ).fetchall()
+            if rows:
+                self._last_id = rows[-1][0]
+            now = time.time()
+            if now >= self._next_prune:
+                connection.execute("DELETE FROM messages WHERE created_at < ?", (now - self.retention,))
+                self._next_prune = now + self.retention / 10
+            return rows
+
+    async def _send(self, topic: str, payload: Any) -> None:
+        await asyncio.to_thread(self._insert, topic, payload)
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                rows = await asyncio.to_thread(self._fetch)
+            except Exception:
+                self.errors += 1
+                logger.exception("Could not read invalidations from %s", self.path)
+                rows = []
+            for _, origin, topic, payload in rows:
+                self._receive(origin, topic, orjson.loads(payload))
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self._fetch)
+        self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> dict:
+        return {**super().stats(), "last_id": self._last_id}
+
+
+class RedisBus(InvalidationBus):
+    """Messages sent over a Redis pub/sub channel."""
+
+    backend = "redis"
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("INVALIDATION_BUS_URL points at Redis but redis is not installed: pip install redis")
+        super().__init__()
+        self._client = redis.from_url(url)
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _send(self, topic: str, payload: Any) -> None:
+        await self._client.publish(REDIS_CHANNEL, orjson.dumps([self.origin, topic, payload]))
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    self._receive(*orjson.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # The next listen() reconnects and subscribes again
+                self.errors += 1
+                logger.exception("Lost the invalidation channel, reconnecting")
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(REDIS_CHANNEL)
+        self._task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.close()
+        await self._client.close()
+
+
+def create_bus(url: str) -> InvalidationBus:
+    scheme = url.split("://", 1)[0]
+    if scheme == "memory":
+        return InvalidationBus()
+    if scheme == "sqlite":
+        return SQLiteBus(
+            make_url(url).database,
+            poll_interval=settings.invalidation_bus_poll_interval_ms / 1000,
+            retention=settings.invalidation_bus_retention_seconds
+        )
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisBus(url)
+    raise ValueError(f"Unsupported INVALIDATION_BUS_URL scheme: {scheme}")
+
+
+invalidation_bus = create_bus(settings.invalidation_bus_url)
@@ -0,0 +1,121 @@
+import re
+from typing import Optional, Tuple
+from sqlalchemy import Select, func, literal_column, or_, text
+from sqlalchemy.engine import Engine
+from ..models.employee import Employee
+from ..models.document import Document
+
+# Columns covered by the full-text index of each searchable model
+SEARCH_FIELDS = {
+    Employee: ("first_name", "last_name", "email"),
+    Document: ("name", "description"),
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokens(term: str):
+    return _TOKEN.findall(term.lower())
+
+
+def _fts_table(model) -> str:
+    return f"{model.__tablename__}_fts"
+
+
+def _sqlite_statements(model):
+    table = model.__tablename__
+    fts = _fts_table(model)
+    fields = SEARCH_FIELDS[model]
+    columns = ", ".join(fields)
+    new_values = ", ".join(f"new.{field}" for field in fields)
+    old_values = ", ".join(f"old.{field}" for field in fields)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{columns}, content='{table}', content_rowid='id', tokenize='unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def _pg_document(model) -> str:
+    fields = SEARCH_FIELDS[model]
+    return " || ' ' || ".join(f"coalesce({field}, '')" for field in fields)
+
+
+def _postgres_statements(model):
+    table = model.__tablename__
+    document = _pg_document(model)
+    statements = [
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} "
+        f"USING gin (to_tsvector('simple', {document}))",
+    ]
+    statements.extend(
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{field}_trgm ON {table} "
+        f"USING gin ({field} gin_trgm_ops)"
+        for field in SEARCH_FIELDS[model]
+    )
+    return statements
+
+
+def ensure_search_indexes(engine: Engine) -> None:
+    """Create the full-text indexes and the triggers that keep them in sync."""
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            for model in SEARCH_FIELDS:
+                fts = _fts_table(model)
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": fts}
+                ).first()
+                for statement in _sqlite_statements(model):
+                    conn.execute(text(statement))
+                if not exists:
+                    # Index rows that were written before the FTS table existed
+                    conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        elif dialect == "postgresql":
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for model in SEARCH_FIELDS:
+                for statement in _postgres_statements(model):
+                    conn.execute(text(statement))
+
+
+def apply_search(query: Select, model, term: str, dialect: str) -> Tuple[Select, Optional[object]]:
+    """Filter ``query`` to rows matching ``term``.
+
+    Returns the filtered statement and a rank expression that sorts ascending
+    from the best match, or None when the backend has no full-text index and
+    the search falls back to a substring match.
+    """
+    tokens = _tokens(term)
+
+    if tokens and dialect == "sqlite":
+        fts = _fts_table(model)
+        match = " ".join(f'"{token}"*' for token in tokens)
+        ranked = (
+            text(f"SELECT rowid, bm25({fts}) AS rank FROM {fts} WHERE {fts} MATCH :match")
+            .bindparams(match=match)
+            .columns(literal_column("rowid"), literal_column("rank"))
+            .subquery(f"{fts}_match")
+        )
+        query = query.join(ranked, model.id == ranked.c.rowid)
+        return query, ranked.c.rank
+
+    if tokens and dialect == "postgresql":
+        # The configuration must be a literal for the expression index to match
+        config = literal_column("'simple'")
+        vector = func.to_tsvector(config, text(_pg_document(model)))
+        tsquery = func.to_tsquery(config, " & ".join(f"{token}:*" for token in tokens))
+        query = query.where(vector.op("@@")(tsquery))
+        return query, -func.ts_rank(vector, tsquery)
+
+    search_term = f"%{term}%"
+    query = query.where(or_(*(
+        getattr(model, field).ilike(search_term) for field in SEARCH_FIELDS[model]
+    )))
+    return query, None
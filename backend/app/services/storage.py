@@ -0,0 +1,279 @@
+import hashlib
+import mimetypes
+import os
+import shutil
+import uuid
+from typing import Dict, List, NamedTuple, Optional
+import aiofiles
+from fastapi import HTTPException, Request, status
+from multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy import delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import get_settings
+from ..models.blob import Blob
+from ..models.document import Document
+
+settings = get_settings()
+
+TEMP_DIR = os.path.join(settings.upload_dir, "tmp")
+
+# Room for boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+# INSERT constructs that support ON CONFLICT, by dialect
+INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# Leading bytes of common formats, used when the filename has no known extension
+SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/msword"),
+]
+
+
+class StoredFile(NamedTuple):
+    path: str
+    size: int
+    content_hash: str
+    content_type: str
+    filename: str = ""
+
+
+def detect_content_type(filename: Optional[str], head: bytes, declared: Optional[str] = None) -> str:
+    guessed = mimetypes.guess_type(filename or "")[0]
+    if guessed:
+        return guessed
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if declared and declared != DEFAULT_CONTENT_TYPE:
+        return declared
+    return DEFAULT_CONTENT_TYPE
+
+
+def blob_path(content_hash: str) -> str:
+    # Two levels of fan-out (256 * 256 directories) keep every directory small
+    return os.path.join(settings.upload_dir, content_hash[:2], content_hash[2:4], content_hash)
+
+
+class _UploadParser:
+    """Collects the bytes of one file field of a multipart body as it is parsed."""
+
+    def __init__(self, boundary: bytes, field: str):
+        self.field = field
+        self.filename = ""
+        self.content_type: Optional[str] = None
+        self.found = False
+        self.pending: List[bytes] = []
+        self._in_field = False
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+        })
+
+    def write(self, chunk: bytes) -> None:
+        self._parser.write(chunk)
+
+    def finalize(self) -> None:
+        self._parser.finalize()
+
+    def _on_part_begin(self) -> None:
+        self._in_field = False
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        filename = options.get(b"filename")
+        # A part without a filename is a plain form value, not a file
+        if self.found or filename is None or options.get(b"name", b"").decode("latin-1") != self.field:
+            return
+        self._in_field = self.found = True
+        self.filename = filename.decode("utf-8", "replace")
+        content_type = self._headers.get(b"content-type")
+        self.content_type = content_type.decode("latin-1") if content_type else None
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_field:
+            self.pending.append(data[start:end])
+
+
+async def receive_upload(request: Request, field: str = "file") -> StoredFile:
+    """Stream the ``field`` file of a multipart request to a temporary file.
+
+    The body is parsed straight from the socket, one chunk at a time, rather
+    than spooled by the framework first. The SHA-256 digest and byte count
+    are computed while copying. An upload is refused with a 413 up front when
+    its Content-Length is too large, or cut off as soon as the file grows
+    past ``max_upload_size``.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Uploads must be sent as multipart/form-data"
+        )
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds the {settings.max_upload_size} byte upload limit"
+    )
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.max_upload_size + MULTIPART_OVERHEAD:
+        raise too_large
+
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    temp_path = os.path.join(TEMP_DIR, f"{uuid.uuid4().hex}.part")
+    parser = _UploadParser(options[b"boundary"], field)
+    hasher = hashlib.sha256()
+    size = 0
+    head = b""
+
+    try:
+        async with aiofiles.open(temp_path, 'wb') as out_file:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                for data in parser.pending:
+                    size += len(data)
+                    if size > settings.max_upload_size:
+                        raise too_large
+                    if len(head) < 16:
+                        head += data[:16 - len(head)]
+                    hasher.update(data)
+                    await out_file.write(data)
+                parser.pending.clear()
+            parser.finalize()
+        if not parser.found:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"No file was sent in the '{field}' field"
+            )
+    except BaseException:
+        remove_file(temp_path)
+        raise
+
+    return StoredFile(
+        path=temp_path,
+        size=size,
+        content_hash=hasher.hexdigest(),
+        content_type=detect_content_type(parser.filename, head, parser.content_type),
+        filename=parser.filename
+    )
+
+
+async def store_blob(db: AsyncSession, stored: StoredFile) -> str:
+    """Move a received upload into the blob store and take a reference to it.
+
+    Returns the blob path. When a blob with the same content already exists
+    the upload is discarded and only the reference count changes. The row
+    is upserted, so concurrent first uploads of the same content both end
+    up referencing one blob instead of one of them failing on the key.
+    """
+    insert = INSERTS[db.get_bind().dialect.name]
+    statement = insert(Blob).values(
+        content_hash=stored.content_hash,
+        file_path=blob_path(stored.content_hash),
+        file_size=stored.size,
+        ref_count=1
+    )
+    try:
+        # An existing blob keeps its path, even if UPLOAD_DIR has moved since
+        path = await db.scalar(
+            statement
+            .on_conflict_do_update(index_elements=[Blob.content_hash], set_={"ref_count": Blob.ref_count + 1})
+            .returning(Blob.file_path)
+        )
+        if not os.path.exists(path):
+            # A new blob, or one whose file has gone missing
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(stored.path, path)
+        return path
+    finally:
+        remove_file(stored.path)
+
+
+async def release_blob(db: AsyncSession, document: Document) -> Optional[str]:
+    """Drop a document's reference to its file.
+
+    Returns the path of the file to move out with ``trash_file`` before the
+    transaction commits, or None while other documents still reference it.
+    """
+    if not document.content_hash:
+        return document.file_path
+
+    result = await db.execute(
+        update(Blob)
+        .where(Blob.content_hash == document.content_hash, Blob.file_path == document.file_path)
+        .values(ref_count=Blob.ref_count - 1)
+    )
+    if not result.rowcount:
+        # Stored before the blob store was introduced: no blob row owns the file
+        return document.file_path
+    result = await db.execute(
+        delete(Blob)
+        .where(Blob.content_hash == document.content_hash, Blob.ref_count <= 0)
+    )
+    return document.file_path if result.rowcount else None
+
+
+def trash_file(path: Optional[str]) -> Optional[str]:
+    """Move a file that is about to lose its last reference out of the store.
+
+    Call it before committing the release. Once the commit drops the blob
+    row, an upload of the same content writes a fresh file at the blob path,
+    and unlinking that path afterwards would delete the new blob. Returns
+    the trash path to remove after the commit, or to ``restore_file`` from
+    if it fails.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    trash_path = os.path.join(TEMP_DIR, f"{uuid.uuid4().hex}.trash")
+    os.replace(path, trash_path)
+    return trash_path
+
+
+def restore_file(trash_path: Optional[str], path: Optional[str]) -> None:
+    if trash_path and path:
+        os.replace(trash_path, path)
+
+
+def clear_store() -> None:
+    """Delete every blob and unfinished upload, once their ``blobs`` rows are gone."""
+    if not os.path.isdir(settings.upload_dir):
+        return
+    for name in os.listdir(settings.upload_dir):
+        path = os.path.join(settings.upload_dir, name)
+        fan_out = len(name) == 2 and all(char in "0123456789abcdef" for char in name)
+        if os.path.isdir(path) and (fan_out or path == TEMP_DIR):
+            shutil.rmtree(path)
+
+
+def remove_file(path: Optional[str]) -> None:
+    if path and os.path.exists(path):
+        os.remove(path)
@@ -1,6 +1,9 @@
 from .auth import (
     verify_password,
     get_password_hash,
+    password_needs_rehash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     get_current_user,
     get_current_active_user,
@@ -10,6 +13,9 @@ from .auth import (
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "password_needs_rehash",
+    "verify_password_async",
+    "get_password_hash_async",
     "create_access_token",
     "get_current_user",
     "get_current_active_user",
@@ -1,31 +1,74 @@
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import NamedTuple, Optional, List
 from jose import JWTError, jwt
-import bcrypt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..config import get_settings
 from ..database import get_db
 from ..models.user import User, UserRole
 from ..schemas.user import TokenData
+from ..services.invalidation import STREAM_TICKETS, USERS, invalidation_bus
+from .cache import ExpiringSet, TTLCache
+from .hashing import hashing_pool, hash_password, check_password, hash_rounds
 
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+
+# Detached User instances keyed by token subject (email). Entries are merged
+# into the request session without a SELECT and evicted whenever a user row
+# is updated or deleted: here at flush, in other workers once the handler
+# publishes the email on the invalidation bus.
+principal_cache = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl_seconds
+)
+invalidation_bus.subscribe(USERS, principal_cache.invalidate)
+
+# Audience of /events tickets, so that a ticket is never taken for an access token
+STREAM_AUDIENCE = "events"
+
+# Ids of the /events tickets redeemed by any worker. A ticket expires at most
+# event_ticket_ttl_seconds after it is issued, so keeping each id that long
+# after redemption outlives the ticket; nothing is evicted before that.
+redeemed_tickets = ExpiringSet(ttl=settings.event_ticket_ttl_seconds)
+invalidation_bus.subscribe(STREAM_TICKETS, redeemed_tickets.add)
+
+# Scope key under which POST /batch hands its already authenticated user to
+# each sub-request, so they skip the token decode and the user lookup.
+BATCH_PRINCIPAL = "employee_hub.batch_principal"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _evict_principal(mapper, connection, target):
+    history = inspect(target).attrs.email.history
+    for email in {target.email, *history.deleted}:
+        principal_cache.invalidate(email)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
-        hashed_password.encode('utf-8')
-    )
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return bcrypt.hashpw(
-        password.encode('utf-8'),
-        bcrypt.gensalt()
-    ).decode('utf-8')
+    return hash_password(password, settings.bcrypt_rounds)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return hash_rounds(hashed_password) != settings.bcrypt_rounds
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(check_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing_pool.run(hash_password, password, settings.bcrypt_rounds)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -39,15 +82,30 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception(detail: str = "Could not validate credentials") -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
+        detail=detail,
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+async def _load_principal(email: str, db: AsyncSession) -> User:
+    cached = principal_cache.get(email)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+
+    user = await db.scalar(select(User).where(User.email == email))
+    if user is None:
+        raise _credentials_exception()
+    db.expunge(user)
+    principal_cache.set(email, user)
+    return await db.merge(user, load=False)
+
+
+async def authenticate_token(token: str, db: AsyncSession) -> User:
+    """The user a bearer token belongs to, merged into ``db``."""
+    credentials_exception = _credentials_exception()
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         email: str = payload.get("sub")
@@ -56,11 +114,74 @@ async def get_current_user(
         token_data = TokenData(email=email, role=payload.get("role"))
     except JWTError:
         raise credentials_exception
+    return await _load_principal(email, db)
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    return user
+
+def create_stream_ticket(token: str) -> str:
+    """A ticket that opens one ``/events`` stream for the holder of ``token``.
+
+    EventSource cannot send headers, and an access token in the URL ends up
+    in access logs. A ticket is only good for one stream within
+    ``event_ticket_ttl_seconds``, and carries the expiry of ``token`` so that
+    the stream ends with it. ``token`` must already have been validated.
+    """
+    claims = jwt.get_unverified_claims(token)
+    expires = min(time.time() + settings.event_ticket_ttl_seconds, claims["exp"])
+    return jwt.encode(
+        {
+            "sub": claims["sub"],
+            "aud": STREAM_AUDIENCE,
+            "jti": uuid.uuid4().hex,
+            "exp": int(expires),
+            "session_exp": claims["exp"],
+        },
+        settings.secret_key,
+        algorithm=settings.algorithm
+    )
+
+
+async def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    principal = request.scope.get(BATCH_PRINCIPAL)
+    if principal is not None:
+        return await db.merge(principal, load=False)
+    return await authenticate_token(token, db)
+
+
+class StreamSession(NamedTuple):
+    user: User
+    # Unix time at which the credentials the stream was opened with expire
+    expires_at: float
+
+
+async def get_stream_session(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    ticket: Optional[str] = Query(
+        None, description="Ticket from POST /events/ticket, for clients such as EventSource that cannot send headers"
+    ),
+    db: AsyncSession = Depends(get_db)
+) -> StreamSession:
+    if token is not None:
+        user = await authenticate_token(token, db)
+        return StreamSession(user, jwt.get_unverified_claims(token)["exp"])
+    if ticket is None:
+        raise _credentials_exception("Not authenticated")
+
+    invalid_ticket = _credentials_exception("Invalid or expired stream ticket")
+    try:
+        payload = jwt.decode(ticket, settings.secret_key, algorithms=[settings.algorithm], audience=STREAM_AUDIENCE)
+    except JWTError:
+        raise invalid_ticket
+    # Access tokens have no audience, which jose lets through
+    ticket_id = payload.get("jti")
+    if payload.get("aud") != STREAM_AUDIENCE or ticket_id is None or ticket_id in redeemed_tickets:
+        raise invalid_ticket
+    # Marks the ticket redeemed here before returning, and in other workers shortly
+    await invalidation_bus.publish(STREAM_TICKETS, ticket_id)
+    return StreamSession(await _load_principal(payload["sub"], db), payload["session_exp"])
 
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache whose entries expire after a TTL.
+
+    ``generation`` moves on with every invalidation. A loader that reads it
+    before going to the database and passes it to ``set`` cannot store a
+    value an invalidation has overtaken meanwhile.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > self._timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (value, self._timer() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self.generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class ExpiringSet:
+    """Thread-safe set whose members are dropped ``ttl`` seconds after being added.
+
+    Unlike ``TTLCache`` it has no size bound, so a member can only leave by
+    expiring. Every member lives for the same ``ttl``, which keeps insertion
+    order the order of expiry.
+    """
+
+    def __init__(self, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._timer = timer
+        self._expiries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable) -> None:
+        with self._lock:
+            self._prune()
+            self._expiries.pop(key, None)
+            self._expiries[key] = self._timer() + self.ttl
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            self._prune()
+            return key in self._expiries
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._prune()
+            return len(self._expiries)
+
+    def _prune(self) -> None:
+        now = self._timer()
+        while self._expiries:
+            key, expires = next(iter(self._expiries.items()))
+            if expires > now:
+                break
+            del self._expiries[key]
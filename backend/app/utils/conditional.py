@@ -0,0 +1,107 @@
+"""Conditional GET for list and detail endpoints.
+
+List ETags combine the table's version (its newest entry in the change
+log) with the caller and the query string; detail ETags use the row's
+``version`` column. Both are looked up with a single index search before
+the handler runs, and a matching ``If-None-Match`` is answered with a 304
+without loading or serializing any rows.
+"""
+
+import hashlib
+from typing import Callable, Optional
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import get_settings
+from ..database import get_read_db
+from ..models.change import Change
+from ..models.user import User
+from .auth import get_current_active_user
+from .downloads import etag_matches
+
+settings = get_settings()
+
+CACHE_CONTROL = "private, no-cache"
+
+# Keyed so that a caller cannot forge another user's ETag to probe for rows
+_ETAG_KEY = hashlib.sha256(settings.secret_key.encode()).digest()
+
+
+def set_etag(response: Response, etag: Optional[str]) -> None:
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def _etag(request: Request, user: User, table: str, *parts) -> str:
+    # Responses differ per caller (leaves are scoped to their owner) and per
+    # query; versions and timestamps are hashed in with them so the tag only
+    # holds characters an entity-tag allows
+    state = "|".join(str(part) for part in (user.id, request.url.query, *parts))
+    digest = hashlib.blake2b(state.encode(), key=_ETAG_KEY, digest_size=12).hexdigest()
+    return f'W/"{table}-{digest}"'
+
+
+def _check(request: Request, etag: str) -> None:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+
+
+def table_version(table: str):
+    """Scalar subquery of the newest change token of ``table``; 0 until it is first written."""
+    return select(func.coalesce(func.max(Change.id), 0)).where(Change.entity == table).scalar_subquery()
+
+
+def list_etag(model, extra: Optional[Callable[[], object]] = None):
+    """Dependency answering 304 for an unchanged list of ``model``, else returning its ETag.
+
+    ``extra`` builds a scalar subquery for anything else the list depends
+    on, such as the next expiry of a list that hides expired rows. It is
+    fetched in the same statement as the version.
+    """
+    table = model.__tablename__
+
+    async def dependency(
+        request: Request,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(get_current_active_user)
+    ) -> str:
+        columns = [table_version(table)]
+        if extra is not None:
+            columns.append(extra())
+        parts = (await db.execute(select(*columns))).one()
+        etag = _etag(request, current_user, table, *parts)
+        _check(request, etag)
+        return etag
+
+    return dependency
+
+
+def row_etag(model, id_param: str):
+    """Dependency answering 304 for an unchanged ``model`` row, else returning its ETag.
+
+    Returns None when the row does not exist, leaving the 404 to the handler.
+    """
+    table = model.__tablename__
+
+    async def dependency(
+        request: Request,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(get_current_active_user)
+    ) -> Optional[str]:
+        try:
+            row_id = int(request.path_params[id_param])
+        except ValueError:
+            return None
+        version = await db.scalar(select(model.version).where(model.id == row_id))
+        if version is None:
+            return None
+        etag = _etag(request, current_user, table, row_id, version)
+        _check(request, etag)
+        return etag
+
+    return dependency
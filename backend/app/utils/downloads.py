@@ -0,0 +1,220 @@
+import os
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import List, Optional, Tuple
+from urllib.parse import quote
+import aiofiles
+from fastapi import Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from ..config import get_settings
+
+settings = get_settings()
+
+# Refuse to build multipart responses for pathological Range headers
+MAX_RANGES = 16
+
+
+def make_etag(content_hash: Optional[str], stat_result: os.stat_result) -> str:
+    if content_hash:
+        return f'"{content_hash}"'
+    # Files stored before content hashing only get a weak validator
+    return f'W/"{int(stat_result.st_mtime)}-{stat_result.st_size}"'
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def etag_matches(header: str, etag: str, weak: bool = True) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        elif not weak and etag.startswith("W/"):
+            continue
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        since = _parse_http_date(if_modified_since)
+        return since is not None and last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _range_applies(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if if_range.strip().startswith(('"', 'W/')):
+        return etag_matches(if_range, etag, weak=False)
+    since = _parse_http_date(if_range)
+    return since is not None and last_modified.replace(microsecond=0) <= since
+
+
+def parse_range(header: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """Parse a ``bytes=`` Range header into sorted, merged inclusive ranges.
+
+    Returns None when the header should be ignored and an empty list when
+    none of the requested ranges can be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    ranges = []
+    for part in spec.split(","):
+        start, sep, end = part.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if start:
+                first = int(start)
+                last = int(end) if end else max(first, size - 1)
+            else:
+                suffix = int(end)
+                if suffix == 0:
+                    continue
+                first, last = max(size - suffix, 0), size - 1
+        except ValueError:
+            return None
+        if first < 0 or last < first:
+            return None
+        if first < size:
+            ranges.append((first, min(last, size - 1)))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged: List[Tuple[int, int]] = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+async def _read_range(path: str, first: int, last: int):
+    async with aiofiles.open(path, "rb") as source:
+        await source.seek(first)
+        remaining = last - first + 1
+        while remaining > 0:
+            chunk = await source.read(min(settings.upload_chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def _read_multipart(path: str, parts: List[Tuple[bytes, int, int]], closing: bytes):
+    for part_header, first, last in parts:
+        yield part_header
+        async for chunk in _read_range(path, first, last):
+            yield chunk
+    yield closing
+
+
+def file_download(
+    request: Request,
+    path: str,
+    filename: str,
+    media_type: str,
+    content_hash: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+) -> Response:
+    """Serve a stored file with validators, conditional GET and byte ranges."""
+    stat_result = os.stat(path)
+    size = stat_result.st_size
+    etag = make_etag(content_hash, stat_result)
+    if last_modified is None:
+        last_modified = datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc)
+    elif last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    headers = {
+        "etag": etag,
+        "last-modified": _http_date(last_modified),
+        "accept-ranges": "bytes",
+        "cache-control": "private, no-cache",
+    }
+
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    quoted = quote(filename)
+    if quoted != filename:
+        headers["content-disposition"] = f"attachment; filename*=utf-8''{quoted}"
+    else:
+        headers["content-disposition"] = f'attachment; filename="{filename}"'
+
+    range_header = request.headers.get("range")
+    ranges = None
+    if range_header and _range_applies(request, etag, last_modified):
+        ranges = parse_range(range_header, size)
+
+    if ranges is None:
+        return FileResponse(path, headers=headers, media_type=media_type, stat_result=stat_result)
+
+    if not ranges:
+        headers["content-range"] = f"bytes */{size}"
+        return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+
+    if len(ranges) == 1:
+        first, last = ranges[0]
+        headers["content-range"] = f"bytes {first}-{last}/{size}"
+        headers["content-length"] = str(last - first + 1)
+        return StreamingResponse(
+            _read_range(path, first, last),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            headers=headers,
+            media_type=media_type
+        )
+
+    boundary = uuid.uuid4().hex
+    parts = []
+    length = 0
+    for first, last in ranges:
+        part_header = (
+            f"--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {first}-{last}/{size}\r\n\r\n"
+        ).encode("latin-1")
+        # Every part after the first is preceded by the CRLF that ends the previous one
+        if parts:
+            part_header = b"\r\n" + part_header
+        parts.append((part_header, first, last))
+        length += len(part_header) + last - first + 1
+    closing = f"\r\n--{boundary}--\r\n".encode("latin-1")
+    headers["content-length"] = str(length + len(closing))
+    return StreamingResponse(
+        _read_multipart(path, parts, closing),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        headers=headers,
+        media_type=f"multipart/byteranges; boundary={boundary}"
+    )
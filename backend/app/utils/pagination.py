@@ -0,0 +1,157 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Date, DateTime, Select, String, and_, or_, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# (expression, descending) pairs; the last one must be unique per row
+OrderBy = Sequence[Tuple[Any, bool]]
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: OrderBy) -> List[Any]:
+    invalid = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise invalid
+    if not isinstance(values, list) or len(values) != len(order_by):
+        raise invalid
+
+    decoded = []
+    for (column, _), value in zip(order_by, values):
+        column_type = getattr(column, "type", None)
+        try:
+            if value is not None and isinstance(column_type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif value is not None and isinstance(column_type, Date):
+                value = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise invalid
+        decoded.append(value)
+    return decoded
+
+
+def _after(order_by: OrderBy, values: Sequence[Any]):
+    columns = [column for column, _ in order_by]
+    directions = {descending for _, descending in order_by}
+    if len(directions) == 1:
+        # Row-value comparison lets the database seek straight into the index
+        if directions.pop():
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    clauses = []
+    for i, (column, descending) in enumerate(order_by):
+        equal = [columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+def keyset_columns(db: AsyncSession, order_by: OrderBy) -> OrderBy:
+    if db.get_bind().dialect.name != "sqlite":
+        return order_by
+    # SQLite keeps datetimes as text in whatever format wrote them (server
+    # defaults carry no microseconds), so compare the stored text itself to
+    # stay consistent with how ORDER BY sorts it.
+    return [
+        (type_coerce(column, String) if isinstance(getattr(column, "type", None), (Date, DateTime)) else column,
+         descending)
+        for column, descending in order_by
+    ]
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order_by: OrderBy,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[list, Optional[str]]:
+    """Return one page of ``query`` and the cursor for the page after it.
+
+    With a cursor the page starts right after the row it encodes, so deep
+    pages cost the same as the first one. Without one, ``skip`` is applied as
+    a plain offset for backward compatibility.
+    """
+    # select(Model) pages yield the objects, select(*columns) pages the row tuples
+    selected = query.column_descriptions
+    width = len(selected)
+    entities = width == 1 and selected[0]["expr"] is selected[0]["entity"]
+    order_by = keyset_columns(db, order_by)
+    if cursor:
+        query = query.where(_after(order_by, decode_cursor(cursor, order_by)))
+
+    keys = [column.label(f"_cursor_{i}") for i, (column, _) in enumerate(order_by)]
+    query = query.add_columns(*keys).order_by(
+        *(column.desc() if descending else column.asc() for column, descending in order_by)
+    )
+    if skip and not cursor:
+        query = query.offset(skip)
+    rows = (await db.execute(query.limit(limit))).all()
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1][width:])
+    if entities:
+        return [row[0] for row in rows], next_cursor
+    return [row[:width] for row in rows], next_cursor
+
+
+def _follows(key: Sequence[Any], values: Sequence[Any], order_by: OrderBy) -> bool:
+    for current, value, (_, descending) in zip(key, values, order_by):
+        if current != value:
+            return current < value if descending else current > value
+    return False
+
+
+def paginate_rows(
+    rows: Sequence[Any],
+    keys: Sequence[Sequence[Any]],
+    order_by: OrderBy,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[list, Optional[str]]:
+    """``paginate`` over rows already in memory, sorted by ``order_by``.
+
+    ``keys`` holds each row's values of the ``keyset_columns`` of
+    ``order_by``, as the database returned them, so cursors are
+    interchangeable with the ones ``paginate`` hands out.
+    """
+    start = skip
+    if cursor:
+        values = decode_cursor(cursor, order_by)
+        start = next((i for i, key in enumerate(keys) if _follows(key, values, order_by)), len(keys))
+    page = list(rows[start:start + limit])
+    next_cursor = None
+    if page and len(page) == limit:
+        next_cursor = encode_cursor(keys[start + limit - 1])
+    return page, next_cursor
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,82 @@
+"""Serve list endpoints straight from Core rows.
+
+Returning ORM objects through ``response_model`` validates every row with
+Pydantic and serializes it a second time; on 100-row pages that is most of
+the request's CPU. List handlers instead select just the columns of their
+response schema and encode the row tuples with orjson. Routes keep their
+``response_model``, so the OpenAPI schema is unchanged.
+
+List routes also accept ``fields=`` to narrow both the SELECT and the
+payload, and ``format=columnar`` to return one array per field instead of
+one object per row.
+"""
+
+from typing import Any, List, Optional, Sequence, Type
+import orjson
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel
+
+OBJECTS = "objects"
+COLUMNAR = "columnar"
+
+
+def schema_columns(schema: Type[BaseModel], model) -> List[Any]:
+    """The model columns backing each field of ``schema``, in field order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_response(rows: Sequence[Sequence[Any]], columns: Sequence[Any], columnar: bool = False) -> Response:
+    """Encode row tuples as a JSON array of objects keyed by column name.
+
+    With ``columnar`` the body is a single object mapping each column name to
+    the list of its values, which repeats no keys and compresses better.
+    """
+    names = [column.key for column in columns]
+    if columnar:
+        values = list(zip(*rows)) if rows else [()] * len(names)
+        content = dict(zip(names, map(list, values)))
+    else:
+        content = [dict(zip(names, row)) for row in rows]
+    return Response(content=orjson.dumps(content), media_type="application/json")
+
+
+class Projection:
+    """The columns and layout a list request asked for."""
+
+    def __init__(self, columns: List[Any], columnar: bool):
+        self.columns = columns
+        self.columnar = columnar
+
+    def response(self, rows: Sequence[Sequence[Any]]) -> Response:
+        return rows_response(rows, self.columns, self.columnar)
+
+
+def projection(schema: Type[BaseModel], model):
+    """Dependency parsing ``fields`` and ``format`` for a list of ``schema``."""
+    available = list(schema.model_fields)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated subset of fields to return: {', '.join(available)}"
+        ),
+        response_format: str = Query(
+            OBJECTS,
+            alias="format",
+            pattern=f"^({OBJECTS}|{COLUMNAR})$",
+            description="objects: an array of objects; columnar: an object of arrays, one per field"
+        ),
+    ) -> Projection:
+        columns = schema_columns(schema, model)
+        requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+        if requested:
+            unknown = requested.difference(available)
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+                )
+            columns = [column for column in columns if column.key in requested]
+        return Projection(columns, response_format == COLUMNAR)
+
+    return dependency
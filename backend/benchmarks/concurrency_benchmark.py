@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Measure API throughput with hundreds of simultaneous clients.
+
+Seeds a fresh database, then drives the ASGI app in-process with ``--clients``
+concurrent httpx clients for ``--seconds``. Each client loops over the list,
+detail and dashboard endpoints as an authenticated admin and, with
+``--write-ratio``, submits leave requests. Reports requests per second,
+latency percentiles and errors.
+
+``--latency-ms`` adds a fixed delay to every statement the database executes,
+in the thread that executes it, to model a database reached over the network.
+Local SQLite answers in microseconds, so without it the run mostly measures
+Python overhead rather than how long handlers wait on the database.
+
+Usage: python benchmarks/concurrency_benchmark.py [--clients 500] [--seconds 10] [--latency-ms 2]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+READ_PATHS = [
+    "/employees/?limit=20",
+    "/leaves/?limit=20",
+    "/announcements/",
+    "/documents/?limit=20",
+    "/dashboard/summary",
+    "/auth/me",
+]
+
+
+def add_statement_latency(engine, seconds):
+    from sqlalchemy import event
+    from sqlalchemy.util import await_only
+
+    def delay(statement):
+        time.sleep(seconds)
+
+    @event.listens_for(engine, "connect")
+    def install(dbapi_connection, connection_record):
+        if isinstance(dbapi_connection, sqlite3.Connection):
+            dbapi_connection.set_trace_callback(delay)
+        else:
+            # aiosqlite runs statements on its own thread; trace there too
+            await_only(dbapi_connection._connection.set_trace_callback(delay))
+
+    engine.dispose()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run(args):
+    import httpx
+    from app import database
+    from app.main import app
+
+    if args.latency_ms:
+        engines = [database.engine]
+        if hasattr(database, "async_engine"):
+            engines.append(database.async_engine.sync_engine)
+        for engine in engines:
+            add_statement_latency(engine, args.latency_ms / 1000)
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        response = await client.post(
+            "/auth/login",
+            data={"username": "armel.nizigiyimana@buychemjapan.com", "password": "password123"}
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        latencies = []
+        errors = {}
+        start_line = asyncio.Event()
+        deadline = 0.0
+
+        async def client_loop(seed):
+            rng = random.Random(seed)
+            await start_line.wait()
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                if rng.random() < args.write_ratio:
+                    start = date.today() + timedelta(days=rng.randint(0, 180))
+                    response = await client.post("/leaves/", headers=headers, json={
+                        "leave_type": "vacation",
+                        "start_date": start.isoformat(),
+                        "end_date": (start + timedelta(days=1)).isoformat(),
+                    })
+                else:
+                    response = await client.get(rng.choice(READ_PATHS), headers=headers)
+                if response.status_code >= 400:
+                    errors[response.status_code] = errors.get(response.status_code, 0) + 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+
+        tasks = [asyncio.create_task(client_loop(seed)) for seed in range(args.clients)]
+        await asyncio.sleep(0)
+        began = time.perf_counter()
+        deadline = began + args.seconds
+        start_line.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - began
+
+    print(f"{args.clients} clients, {args.seconds}s, {args.latency_ms} ms per statement, "
+          f"{args.write_ratio:.0%} writes")
+    if not latencies:
+        print(f"no successful requests, errors: {errors}")
+        return
+    print(f"  requests/s  {len(latencies) / elapsed:10.1f}")
+    print(f"  p50 ms      {statistics.median(latencies) * 1000:10.1f}")
+    print(f"  p95 ms      {percentile(latencies, 0.95) * 1000:10.1f}")
+    print(f"  p99 ms      {percentile(latencies, 0.99) * 1000:10.1f}")
+    print(f"  errors      {errors or 0}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--write-ratio", type=float, default=0.0)
+    args = parser.parse_args()
+
+    # Configure the app before it is imported: throwaway database, cheap hashes
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    import seed_data
+    seed_data.main()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
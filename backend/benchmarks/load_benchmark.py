@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Repeatable load benchmark of realistic mixed workloads.
+
+Generates a synthetic data set with ``seed_data.py``, boots ``app.main:app``
+in-process and drives each workload with ``--clients`` concurrent async
+clients for ``--seconds``:
+
+  login       a login storm across many accounts
+  dashboard   employees opening the dashboard (profile, summary, lists)
+  batch       the same dashboard loaded with a single POST /batch
+  search      typing a name into the employee search, one keystroke at a time
+  leaves      employees submitting leave requests and managers approving them
+  documents   uploading, listing and downloading documents
+
+Throughput and p50/p95/p99 latency are reported per endpoint and written to
+a JSON file. With ``--baseline`` the run is compared with a stored result
+and the script exits 1 when an endpoint's p95 latency or throughput
+regressed by more than ``--tolerance``.
+
+Bcrypt defaults to 4 rounds like the other benchmarks; run with
+``BCRYPT_ROUNDS=12`` to see the login storm at production cost.
+
+Usage: python benchmarks/load_benchmark.py [--workloads login,search] [--clients 50] [--seconds 5]
+       [--output load.json] [--baseline benchmarks/load_baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "load_baseline.json")
+ADMIN_EMAIL = "armel.nizigiyimana@buychemjapan.com"
+PASSWORD = "password123"
+ACCOUNTS = 200
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Recorder:
+    """Collect latencies and failures per endpoint label."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    async def call(self, client, label, method, url, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            self.errors[label] = self.errors.get(label, 0) + 1
+        else:
+            self.latencies.setdefault(label, []).append(elapsed)
+        return response
+
+    def summary(self, seconds):
+        endpoints = {}
+        for label in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies.get(label, [])
+            endpoints[label] = {
+                "requests": len(samples),
+                "errors": self.errors.get(label, 0),
+                "throughput": round(len(samples) / seconds, 1),
+                "p50_ms": round(statistics.median(samples) * 1000, 2) if samples else None,
+                "p95_ms": round(percentile(samples, 0.95) * 1000, 2) if samples else None,
+                "p99_ms": round(percentile(samples, 0.99) * 1000, 2) if samples else None,
+            }
+        return endpoints
+
+
+class Context:
+    """Accounts and tokens shared by the virtual users."""
+
+    def __init__(self, employees, managers, names):
+        self.employees = employees  # [(email, headers)]
+        self.managers = managers
+        self.names = names
+
+
+async def login_storm(client, context, rng, recorder):
+    email, _ = rng.choice(context.employees)
+    await recorder.call(client, "POST /auth/login", "POST", "/auth/login",
+                        data={"username": email, "password": PASSWORD})
+
+
+async def dashboard(client, context, rng, recorder):
+    _, headers = rng.choice(context.employees)
+    await recorder.call(client, "GET /auth/me", "GET", "/auth/me", headers=headers)
+    await recorder.call(client, "GET /dashboard/summary", "GET", "/dashboard/summary", headers=headers)
+    await recorder.call(client, "GET /announcements/", "GET", "/announcements/", headers=headers)
+    await recorder.call(client, "GET /leaves/", "GET", "/leaves/", headers=headers, params={"limit": 20})
+
+
+async def dashboard_batch(client, context, rng, recorder):
+    _, headers = rng.choice(context.employees)
+    await recorder.call(client, "POST /batch", "POST", "/batch", headers=headers, json={"requests": [
+        {"path": "/auth/me"},
+        {"path": "/dashboard/summary"},
+        {"path": "/announcements/"},
+        {"path": "/leaves/?limit=20"},
+    ]})
+
+
+async def search_typing(client, context, rng, recorder):
+    _, headers = rng.choice(context.managers)
+    name = rng.choice(context.names)
+    for length in range(2, len(name) + 1):
+        await recorder.call(client, "GET /employees/?search", "GET", "/employees/", headers=headers,
+                            params={"search": name[:length], "limit": 20})
+
+
+async def leave_cycle(client, context, rng, recorder):
+    _, headers = rng.choice(context.employees)
+    start = date.today() + timedelta(days=rng.randint(1, 180))
+    response = await recorder.call(client, "POST /leaves/", "POST", "/leaves/", headers=headers, json={
+        "leave_type": "vacation",
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=rng.randint(0, 5))).isoformat(),
+        "reason": "Load test",
+    })
+    if response.status_code == 201:
+        _, manager_headers = rng.choice(context.managers)
+        await recorder.call(client, "PUT /leaves/{id}/approve", "PUT",
+                            f"/leaves/{response.json()['id']}/approve", headers=manager_headers,
+                            json={"status": rng.choice(["approved", "rejected"])})
+
+
+async def document_cycle(client, context, rng, recorder):
+    _, headers = rng.choice(context.employees)
+    content = rng.randbytes(rng.randint(4, 64) * 1024)
+    response = await recorder.call(client, "POST /documents/upload", "POST", "/documents/upload",
+                                   headers=headers, params={"category": "HR"},
+                                   files={"file": (f"report-{rng.random():.6f}.pdf", content, "application/pdf")})
+    await recorder.call(client, "GET /documents/", "GET", "/documents/", headers=headers, params={"limit": 20})
+    if response.status_code == 201:
+        await recorder.call(client, "GET /documents/{id}/download", "GET",
+                            f"/documents/{response.json()['id']}/download", headers=headers)
+
+
+WORKLOADS = {
+    "login": login_storm,
+    "dashboard": dashboard,
+    "batch": dashboard_batch,
+    "search": search_typing,
+    "leaves": leave_cycle,
+    "documents": document_cycle,
+}
+
+
+async def prepare(client, args):
+    from sqlalchemy import select
+    from app.database import SessionLocal
+    from app.models.employee import Employee
+    from app.models.user import User, UserRole
+
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(User.email, User.role).order_by(User.id).limit(ACCOUNTS)
+        ).all()
+        names = sorted({name.lower() for name in db.scalars(select(Employee.last_name).limit(ACCOUNTS))})
+
+    async def token(email):
+        response = await client.post("/auth/login", data={"username": email, "password": PASSWORD})
+        response.raise_for_status()
+        return email, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    employees = [await token(email) for email, role in rows if role == UserRole.EMPLOYEE]
+    managers = [await token(email) for email, role in rows if role != UserRole.EMPLOYEE]
+    return Context(employees, managers, names)
+
+
+async def run_workload(client, context, name, args):
+    workload = WORKLOADS[name]
+    recorder = Recorder()
+    start_line = asyncio.Event()
+    deadline = 0.0
+
+    async def virtual_user(seed):
+        rng = random.Random(f"{args.seed}-{name}-{seed}")
+        await start_line.wait()
+        while time.perf_counter() < deadline:
+            await workload(client, context, rng, recorder)
+
+    tasks = [asyncio.create_task(virtual_user(seed)) for seed in range(args.clients)]
+    await asyncio.sleep(0)
+    began = time.perf_counter()
+    deadline = began + args.seconds
+    start_line.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - began
+
+    endpoints = recorder.summary(elapsed)
+    return {
+        "seconds": round(elapsed, 2),
+        "throughput": round(sum(stats["requests"] for stats in endpoints.values()) / elapsed, 1),
+        "endpoints": endpoints,
+    }
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        context = await prepare(client, args)
+        results = {}
+        for name in args.workloads:
+            results[name] = await run_workload(client, context, name, args)
+            print_workload(name, results[name])
+    return results
+
+
+def print_workload(name, result):
+    print(f"\n{name}: {result['throughput']} req/s over {result['seconds']}s")
+    print(f"  {'endpoint':32} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for label, stats in result["endpoints"].items():
+        print(f"  {label:32} {stats['throughput']:8.1f} {stats['p50_ms'] or 0:8.1f} "
+              f"{stats['p95_ms'] or 0:8.1f} {stats['p99_ms'] or 0:8.1f} {stats['errors']:7}")
+
+
+def compare(results, baseline, tolerance):
+    """Return a line for every endpoint that regressed against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        for label, stats in result["endpoints"].items():
+            before = baseline.get("workloads", {}).get(name, {}).get("endpoints", {}).get(label)
+            if not before or not stats["p95_ms"] or not before["p95_ms"]:
+                continue
+            if stats["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{name} {label}: p95 {before['p95_ms']} -> {stats['p95_ms']} ms")
+            if stats["throughput"] < before["throughput"] * (1 - tolerance):
+                regressions.append(f"{name} {label}: {before['throughput']} -> {stats['throughput']} req/s")
+            if stats["errors"] > before["errors"]:
+                regressions.append(f"{name} {label}: {before['errors']} -> {stats['errors']} errors")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workloads", default=",".join(WORKLOADS),
+                        help=f"comma-separated subset of {', '.join(WORKLOADS)}")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5, help="duration of each workload")
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--leaves-per-employee", type=float, default=5)
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="load_benchmark.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help=f"results to compare against, e.g. {os.path.relpath(BASELINE_FILE)}")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative p95/throughput regression before failing")
+    args = parser.parse_args()
+    args.workloads = [name.strip() for name in args.workloads.split(",") if name.strip()]
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown))}")
+
+    # Configure the app before it is imported: throwaway database and uploads, cheap hashes, quiet request logs
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'load.db')}"
+    os.environ["UPLOAD_DIR"] = os.path.join(workdir, "uploads")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    import seed_data
+    seed_data.main(seed_data.parse_args([
+        "--employees", str(args.employees),
+        "--leaves-per-employee", str(args.leaves_per_employee),
+        "--documents", str(args.documents),
+        "--seed", str(args.seed),
+    ]))
+
+    results = asyncio.run(run(args))
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "options": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "workloads": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+        output.write("\n")
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        if regressions:
+            print(f"Regressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
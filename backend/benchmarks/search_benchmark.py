@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Compare employee search latency: leading-wildcard LIKE vs the FTS index.
+
+Usage: python benchmarks/search_benchmark.py [--rows 100000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+FIRST_NAMES = ["Emily", "David", "Jessica", "Daniel", "Ashley", "James", "Amanda", "Robert",
+               "Sophia", "William", "Olivia", "Christopher", "Sarah", "Michael", "John", "Laura"]
+LAST_NAMES = ["Brown", "Jones", "Garcia", "Martinez", "Anderson", "Taylor", "Thomas", "Jackson",
+              "White", "Harris", "Martin", "Lee", "Smith", "Johnson", "Williams", "Clark"]
+TERMS = ["em", "emily", "gar", "smith j", "olivia.white", "jackson4242", "nomatch"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "search_benchmark.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import insert, or_, select
+    from app.database import Base, SessionLocal, engine
+    from app.models.employee import Employee
+    from app.services.search import apply_search, ensure_search_indexes
+
+    Base.metadata.create_all(bind=engine)
+    ensure_search_indexes(engine)
+
+    rng = random.Random(42)
+    rows = []
+    for i in range(args.rows):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append({
+            "user_id": i + 1,
+            "first_name": first,
+            "last_name": f"{last}{i}",
+            "email": f"{first.lower()}.{last.lower()}{i}@company.com",
+        })
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), rows)
+
+    db = SessionLocal()
+
+    def like(term):
+        pattern = f"%{term}%"
+        return db.query(Employee).filter(or_(
+            Employee.first_name.ilike(pattern),
+            Employee.last_name.ilike(pattern),
+            Employee.email.ilike(pattern)
+        )).limit(100).all()
+
+    def fts(term):
+        query, rank = apply_search(select(Employee), Employee, term, engine.dialect.name)
+        return db.scalars(query.order_by(rank).limit(100)).all()
+
+    print(f"{args.rows} employees, {args.repeat} runs per term (median ms)")
+    print(f"{'term':<16}{'LIKE':>10}{'FTS':>10}")
+    for term in TERMS:
+        results = []
+        for search in (like, fts):
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                search(term)
+                timings.append((time.perf_counter() - start) * 1000)
+            results.append(statistics.median(timings))
+        print(f"{term:<16}{results[0]:>10.2f}{results[1]:>10.2f}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
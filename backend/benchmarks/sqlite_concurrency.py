@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Compare read/write throughput of the default and tuned SQLite profiles.
+
+Runs concurrent leave submitters and leave-list readers against a fresh
+database for each profile and reports completed operations per second and
+"database is locked" failures. Profiles: the original engine setup, the
+pragma profile alone, and the pragma profile with serialized writers.
+
+Usage: python benchmarks/sqlite_concurrency.py [--writers 8] [--readers 8] [--seconds 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def run_profile(name, pragmas, lock, args):
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base, configure_sqlite, serialize_writes
+    from app.models.employee import Employee
+    from app.models.leave import Leave, LeaveType
+
+    path = os.path.join(tempfile.mkdtemp(dir=args.dir), f"{name}.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    if pragmas:
+        configure_sqlite(engine)
+    if lock:
+        serialize_writes(session_factory)
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Employee), [
+            {"user_id": i, "first_name": "Bench", "last_name": str(i), "email": f"bench{i}@company.com"}
+            for i in range(1, 201)
+        ])
+
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    counts_lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def record(key):
+        with counts_lock:
+            counts[key] += 1
+
+    def writer(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            db = session_factory()
+            try:
+                start = date.today() + timedelta(days=rng.randint(0, 90))
+                db.add(Leave(
+                    employee_id=rng.randint(1, 200),
+                    leave_type=LeaveType.VACATION,
+                    start_date=start,
+                    end_date=start + timedelta(days=rng.randint(1, 10)),
+                ))
+                db.commit()
+                record("writes")
+            except OperationalError:
+                db.rollback()
+                record("locked")
+            finally:
+                db.close()
+
+    def reader():
+        while time.perf_counter() < deadline:
+            db = session_factory()
+            try:
+                db.query(Leave).order_by(Leave.created_at.desc()).limit(100).all()
+                record("reads")
+            except OperationalError:
+                record("locked")
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    print(f"{name:<16}{counts['reads'] / args.seconds:>12.0f}{counts['writes'] / args.seconds:>12.0f}"
+          f"{counts['locked']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--dir", default=None, help="where to create the databases (use a real disk, not tmpfs)")
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:g}s per profile")
+    print(f"{'profile':<16}{'reads/s':>12}{'writes/s':>12}{'locked':>10}")
+    run_profile("default", False, False, args)
+    run_profile("pragmas", True, False, args)
+    run_profile("pragmas+writer", True, True, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""dashboard counters, blob store and document content metadata
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created with create_all before migrations existed may
+    # already have some of these objects.
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if 'counters' not in tables:
+        op.create_table(
+            'counters',
+            sa.Column('metric', sa.String(length=50), nullable=False),
+            sa.Column('key', sa.String(length=255), nullable=False),
+            sa.Column('value', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('metric', 'key')
+        )
+
+    if 'blobs' not in tables:
+        op.create_table(
+            'blobs',
+            sa.Column('content_hash', sa.String(length=64), nullable=False),
+            sa.Column('file_path', sa.String(length=500), nullable=False),
+            sa.Column('file_size', sa.BigInteger(), nullable=False),
+            sa.Column('ref_count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('content_hash')
+        )
+
+    columns = {column['name'] for column in inspector.get_columns('documents')}
+    with op.batch_alter_table('documents') as batch_op:
+        if 'file_size' not in columns:
+            batch_op.add_column(sa.Column('file_size', sa.BigInteger(), nullable=True))
+        if 'content_hash' not in columns:
+            batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        if 'content_type' not in columns:
+            batch_op.add_column(sa.Column('content_type', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('documents') as batch_op:
+        batch_op.drop_column('content_type')
+        batch_op.drop_column('content_hash')
+        batch_op.drop_column('file_size')
+    op.drop_table('blobs')
+    op.drop_table('counters')
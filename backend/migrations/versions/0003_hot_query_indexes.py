@@ -0,0 +1,40 @@
+"""composite indexes for the router filters and orderings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns); each matches a WHERE + ORDER BY used in app/routers
+INDEXES = [
+    ('ix_leaves_created_at_id', 'leaves', ['created_at', 'id']),
+    ('ix_leaves_employee_id_created_at_id', 'leaves', ['employee_id', 'created_at', 'id']),
+    ('ix_leaves_status_created_at_id', 'leaves', ['status', 'created_at', 'id']),
+    ('ix_announcements_created_at_id', 'announcements', ['created_at', 'id']),
+    ('ix_announcements_priority_created_at_id', 'announcements', ['priority', 'created_at', 'id']),
+    ('ix_announcements_expires_at', 'announcements', ['expires_at']),
+    ('ix_documents_created_at_id', 'documents', ['created_at', 'id']),
+    ('ix_documents_category_created_at_id', 'documents', ['category', 'created_at', 'id']),
+    ('ix_employees_department_id', 'employees', ['department', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,40 @@
+"""row versions and update times for conditional GETs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# leaves already has updated_at
+UPDATED_AT_TABLES = ['employees', 'announcements', 'documents']
+VERSIONED_TABLES = ['employees', 'leaves', 'announcements', 'documents']
+
+
+def upgrade() -> None:
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            if table in UPDATED_AT_TABLES:
+                batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.create_index('ix_changes_entity_id', 'changes', ['entity', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_changes_entity_id', table_name='changes')
+    for table in reversed(VERSIONED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
+            if table in UPDATED_AT_TABLES:
+                batch_op.drop_column('updated_at')
@@ -0,0 +1,34 @@
+"""record how far the change log has been pruned
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'change_log_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('pruned_through', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Earlier prunes left no reliable mark: treat every existing change as
+    # possibly pruned, so clients holding older tokens reload once
+    op.execute("INSERT INTO change_log_state (id, pruned_through) SELECT 1, coalesce(max(id), 0) FROM changes")
+
+
+def downgrade() -> None:
+    op.drop_table('change_log_state')
@@ -1,26 +1,53 @@
 #!/usr/bin/env python3
-"""Seed script to populate the database with sample data."""
+"""Seed script to populate the database with sample data.
+
+Without arguments it creates the small demo data set. For capacity planning
+and benchmarks it can generate synthetic data on top of it, e.g.:
+
+    python seed_data.py --employees 200000 --leaves-per-employee 20 --documents 500000
+
+Rows are written with bulk INSERTs in batched transactions, ids are assigned
+up front so no row has to be read back, and the demo password is hashed once
+and shared by every account. The same --seed always produces the same data
+(relative to today's date).
+"""
 
 import sys
 sys.path.insert(0, '.')
 
-from datetime import date, datetime, timedelta
+import argparse
+import bisect
+import itertools
+import math
 import random
-from app.database import SessionLocal, engine, Base
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+from app.database import SessionLocal
+from app.migrate import run_migrations
 from app.models.user import User, UserRole
 from app.models.employee import Employee
 from app.models.leave import Leave, LeaveType, LeaveStatus
 from app.models.announcement import Announcement, Priority
 from app.models.document import Document
+from app.models.blob import Blob
+from app.models.counter import Counter
+from app.services import storage
+from app.services.changes import reset_change_log
+from app.services.counters import rebuild_counters
 from app.utils.auth import get_password_hash
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Create or upgrade all tables
+run_migrations()
 
 db = SessionLocal()
 
+DEMO_PASSWORD = "password123"
+
 # Sample data
 departments = ["Engineering", "Marketing", "Sales", "HR", "Finance", "Operations"]
+# Relative headcount of each department in generated data
+department_weights = [30, 12, 20, 6, 10, 22]
 positions = {
     "Engineering": ["Software Engineer", "Senior Developer", "Tech Lead", "DevOps Engineer"],
     "Marketing": ["Marketing Manager", "Content Writer", "SEO Specialist", "Brand Manager"],
@@ -30,6 +57,19 @@ positions = {
     "Operations": ["Operations Manager", "Project Manager", "Logistics Coordinator", "Admin Assistant"]
 }
 
+first_names = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Karen",
+    "Daniel", "Lisa", "Matthew", "Nancy", "Anthony", "Betty", "Mark", "Sandra", "Hiroshi", "Ashley",
+    "Kenji", "Yuki", "Amina", "Fatima", "Chen", "Wei", "Priya", "Arjun", "Olga", "Ivan",
+]
+last_names = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Tanaka", "Suzuki", "Sato", "Nakamura", "Okafor", "Mensah", "Kowalski", "Novak", "Singh", "Patel",
+]
+
 employees_data = [
     {"first_name": "Armel", "last_name": "NIZIGIYIMANA", "email": "armel.nizigiyimana@buychemjapan.com", "role": UserRole.ADMIN},
     {"first_name": "John", "last_name": "Smith", "role": UserRole.MANAGER},
@@ -70,142 +110,357 @@ documents_data = [
     {"name": "Travel Policy.pdf", "description": "Business travel policies and procedures", "category": "Policy"},
 ]
 
+document_topics = {
+    "Policy": ["Leave Policy", "Travel Policy", "Data Retention Policy", "Equipment Policy", "Conduct Addendum"],
+    "HR": ["Performance Review", "Offer Letter", "Training Record", "Benefits Enrollment", "Exit Interview"],
+    "Finance": ["Expense Report", "Budget Forecast", "Invoice", "Payroll Summary", "Audit Notes"],
+    "IT": ["Access Request", "Incident Report", "Runbook", "Architecture Overview", "Asset Inventory"],
+    "Legal": ["Contract", "NDA", "Compliance Checklist", "Vendor Agreement"],
+}
+category_weights = {"Policy": 10, "HR": 35, "Finance": 30, "IT": 15, "Legal": 10}
+file_types = [(".pdf", "application/pdf", 60), (".docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", 25),
+              (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", 15)]
+
+announcement_topics = [
+    "Quarterly All-Hands", "Benefits Enrollment Reminder", "Office Closure", "Security Awareness Training",
+    "New Hire Welcome", "System Maintenance Window", "Wellness Week", "Policy Update", "Town Hall Recap",
+]
+
+# Typical share and length (in days) of each leave type
+leave_type_weights = {
+    LeaveType.VACATION: 45, LeaveType.SICK: 25, LeaveType.PERSONAL: 18,
+    LeaveType.OTHER: 6, LeaveType.MATERNITY: 3, LeaveType.PATERNITY: 3,
+}
+leave_durations = {
+    LeaveType.VACATION: (1, 14), LeaveType.SICK: (1, 3), LeaveType.PERSONAL: (1, 2),
+    LeaveType.OTHER: (1, 5), LeaveType.MATERNITY: (60, 120), LeaveType.PATERNITY: (10, 20),
+}
+# Relative likelihood of a leave starting in each month (Jan..Dec): vacations
+# peak in summer and December, sick leave in winter.
+leave_seasonality = {
+    LeaveType.VACATION: [4, 3, 5, 6, 7, 9, 14, 14, 7, 5, 4, 12],
+    LeaveType.SICK: [14, 13, 10, 7, 5, 4, 4, 4, 6, 8, 11, 14],
+}
+leave_reasons = ["Family vacation", "Personal matters", "Medical appointment", "Wedding attendance", "Home repairs", None]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Populate the database with demo or synthetic data.")
+    parser.add_argument("--employees", type=int, default=len(employees_data),
+                        help="total employees, including the named demo accounts")
+    parser.add_argument("--leaves-per-employee", type=float, default=1.5,
+                        help="average leave requests per employee")
+    parser.add_argument("--documents", type=int, default=len(documents_data),
+                        help="total documents, including the demo documents")
+    parser.add_argument("--announcements", type=int, default=len(announcements_data),
+                        help="total announcements, including the demo announcements")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--batch-size", type=int, default=20000, help="rows per INSERT transaction")
+    return parser.parse_args(argv)
+
+
 def clear_data():
     """Clear existing data."""
+    db.query(Counter).delete()
     db.query(Leave).delete()
     db.query(Document).delete()
     db.query(Announcement).delete()
     db.query(Employee).delete()
     db.query(User).delete()
+    db.query(Blob).delete()
     db.commit()
+    storage.clear_store()
+    # Every synced row is about to be replaced
+    reset_change_log(db)
     print("Cleared existing data")
 
-def seed_users_and_employees():
-    """Create users and their employee profiles."""
-    created_users = []
 
-    for i, emp_data in enumerate(employees_data):
-        email = emp_data.get('email', f"{emp_data['first_name'].lower()}.{emp_data['last_name'].lower()}@company.com")
+def insert_batches(model, rows, batch_size):
+    """Bulk INSERT ``rows`` (an iterable of dicts), committing every ``batch_size`` rows.
+
+    Secondary indexes are dropped for the load and rebuilt afterwards: one
+    sorted build is far cheaper than updating every B-tree on each insert.
+    """
+    table = model.__table__
+    secondary = [index for index in table.indexes if not index.unique]
+    for index in secondary:
+        index.drop(db.connection(), checkfirst=True)
+    db.commit()
+
+    dialect = db.get_bind().dialect
+    statement = {}
 
-        # Create user
-        user = User(
-            email=email,
-            password_hash=get_password_hash("password123"),
-            role=emp_data['role']
-        )
-        db.add(user)
-        db.flush()
-
-        # Create employee profile
-        dept = random.choice(departments)
-        employee = Employee(
-            user_id=user.id,
-            first_name=emp_data['first_name'],
-            last_name=emp_data['last_name'],
-            email=email,
-            phone=f"+1-555-{random.randint(100,999)}-{random.randint(1000,9999)}",
-            department=dept,
-            position=random.choice(positions[dept]),
-            hire_date=date.today() - timedelta(days=random.randint(30, 1500))
-        )
-        db.add(employee)
-        created_users.append((user, employee))
+    def write(batch):
+        # Compile once and run the column type conversions ourselves: through
+        # Core, per-row parameter handling costs more than the INSERT itself
+        if not statement:
+            compiled = table.insert().compile(dialect=dialect, column_keys=list(batch[0]))
+            statement["sql"] = compiled.string
+            statement["positional"] = compiled.positional
+            statement["keys"] = keys = compiled.positiontup if compiled.positional else list(batch[0])
+            statement["processors"] = [table.c[key].type._cached_bind_processor(dialect) for key in keys]
+        columns = []
+        for key, processor in zip(statement["keys"], statement["processors"]):
+            values = [row[key] for row in batch]
+            columns.append(list(map(processor, values)) if processor else values)
+        if statement["positional"]:
+            params = list(zip(*columns))
+        else:
+            params = [dict(zip(statement["keys"], values)) for values in zip(*columns)]
+        db.connection().exec_driver_sql(statement["sql"], params)
+        db.commit()
 
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            write(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        write(batch)
+        count += len(batch)
+
+    for index in secondary:
+        index.create(db.connection(), checkfirst=True)
     db.commit()
-    print(f"Created {len(created_users)} users and employees")
-    return created_users
 
-def seed_announcements(admin_user):
+    if db.get_bind().dialect.name == "postgresql":
+        # Ids were assigned explicitly, so move the sequence past them
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT coalesce(max(id), 1) FROM {table.name}))"
+        ))
+        db.commit()
+    return count
+
+
+class Weighted:
+    """Draw values in proportion to their weights with a single ``random()`` call."""
+
+    def __init__(self, weights):
+        self.values = list(weights)
+        self.cumulative = list(itertools.accumulate(weights.values()))
+        self.total = self.cumulative[-1]
+
+    def pick(self, rng):
+        return self.values[bisect.bisect(self.cumulative, rng.random() * self.total)]
+
+
+def pick(rng, values):
+    return values[int(rng.random() * len(values))]
+
+
+def generated_people(rng, count):
+    """Yield (user_id, role, first_name, last_name, email) for every employee to create."""
+    for i, emp_data in enumerate(employees_data[:count], start=1):
+        email = emp_data.get('email', f"{emp_data['first_name'].lower()}.{emp_data['last_name'].lower()}@company.com")
+        yield i, emp_data['role'], emp_data['first_name'], emp_data['last_name'], email
+
+    for i in range(len(employees_data) + 1, count + 1):
+        first_name = pick(rng, first_names)
+        last_name = pick(rng, last_names)
+        # Roughly one manager per eight people and a handful of admins
+        roll = rng.random()
+        role = UserRole.ADMIN if roll < 0.001 else UserRole.MANAGER if roll < 0.125 else UserRole.EMPLOYEE
+        yield i, role, first_name, last_name, f"{first_name.lower()}.{last_name.lower()}.{i}@company.com"
+
+
+def seed_users_and_employees(rng, options, password_hash):
+    """Create users and their employee profiles; returns the user ids of each role."""
+    people = list(generated_people(rng, max(options.employees, 1)))
+    today = date.today()
+    department_picker = Weighted(dict(zip(departments, department_weights)))
+
+    users = ({"id": user_id, "email": email, "password_hash": password_hash, "role": role}
+             for user_id, role, _, _, email in people)
+    insert_batches(User, users, options.batch_size)
+
+    def employees():
+        for user_id, role, first_name, last_name, email in people:
+            dept = department_picker.pick(rng)
+            # Most of the workforce was hired in the last few years
+            hire_date = today - timedelta(days=min(int(rng.expovariate(1 / 900)) + 30, 3650))
+            yield {
+                "id": user_id,
+                "user_id": user_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email,
+                "phone": f"+1-555-{100 + int(rng.random() * 900)}-{1000 + int(rng.random() * 9000)}",
+                "department": dept,
+                "position": pick(rng, positions[dept]),
+                "hire_date": hire_date,
+            }
+
+    insert_batches(Employee, employees(), options.batch_size)
+    print(f"Created {len(people)} users and employees")
+
+    by_role = {role: [user_id for user_id, user_role, *_ in people if user_role == role] for role in UserRole}
+    return by_role
+
+
+def seed_announcements(rng, options, authors):
     """Create announcements."""
-    for i, ann_data in enumerate(announcements_data):
-        announcement = Announcement(
-            title=ann_data['title'],
-            content=ann_data['content'],
-            priority=ann_data['priority'],
-            author_id=admin_user.id,
-            created_at=datetime.now() - timedelta(days=i * 2)
-        )
-        db.add(announcement)
+    now = datetime.now()
+    priority_picker = Weighted({Priority.LOW: 50, Priority.MEDIUM: 35, Priority.HIGH: 15})
 
-    db.commit()
-    print(f"Created {len(announcements_data)} announcements")
+    def rows():
+        for i, ann_data in enumerate(announcements_data[:options.announcements]):
+            yield {
+                "id": i + 1,
+                "title": ann_data['title'],
+                "content": ann_data['content'],
+                "priority": ann_data['priority'],
+                "author_id": authors[0],
+                "created_at": now - timedelta(days=i * 2),
+                "expires_at": None,
+            }
+        for i in range(len(announcements_data), options.announcements):
+            created_at = now - timedelta(minutes=int(rng.random() * 365 * 24 * 60))
+            topic = pick(rng, announcement_topics)
+            yield {
+                "id": i + 1,
+                "title": f"{topic} #{i + 1}",
+                "content": f"{topic}: details for all staff. Please read and reach out to your manager with questions.",
+                "priority": priority_picker.pick(rng),
+                "author_id": pick(rng, authors),
+                "created_at": created_at,
+                # About two in five expire a few weeks after being posted
+                "expires_at": created_at + timedelta(days=7 + int(rng.random() * 54)) if rng.random() < 0.4 else None,
+            }
 
-def seed_leaves(employees):
+    count = insert_batches(Announcement, rows(), options.batch_size)
+    print(f"Created {count} announcements")
+
+
+def leave_start_pickers(today):
+    """Per leave type, a picker of start dates between a year ago and three months ahead, following the season."""
+    days = [today + timedelta(days=offset) for offset in range(-365, 91)]
+    return {
+        leave_type: Weighted({day: leave_seasonality.get(leave_type, [1] * 12)[day.month - 1] for day in days})
+        for leave_type in LeaveType
+    }
+
+
+def seed_leaves(rng, options, employee_count, approvers):
     """Create leave requests."""
-    leave_types = list(LeaveType)
-    statuses = [LeaveStatus.PENDING, LeaveStatus.APPROVED, LeaveStatus.APPROVED, LeaveStatus.REJECTED]
-
-    leaves_created = 0
-    for user, employee in employees:
-        # Each employee has 0-3 leave requests
-        num_leaves = random.randint(0, 3)
-        for _ in range(num_leaves):
-            start = date.today() + timedelta(days=random.randint(-30, 60))
-            duration = random.randint(1, 10)
-
-            leave = Leave(
-                employee_id=employee.id,
-                leave_type=random.choice(leave_types),
-                start_date=start,
-                end_date=start + timedelta(days=duration),
-                status=random.choice(statuses),
-                reason=random.choice([
-                    "Family vacation",
-                    "Personal matters",
-                    "Medical appointment",
-                    "Wedding attendance",
-                    "Home repairs",
-                    None
-                ])
-            )
-            db.add(leave)
-            leaves_created += 1
+    today = date.today()
+    mean = options.leaves_per_employee
+    type_picker = Weighted(leave_type_weights)
+    start_pickers = leave_start_pickers(today)
+    past_status = Weighted({LeaveStatus.APPROVED: 80, LeaveStatus.REJECTED: 12, LeaveStatus.PENDING: 8})
+    upcoming_status = Weighted({LeaveStatus.PENDING: 55, LeaveStatus.APPROVED: 40, LeaveStatus.REJECTED: 5})
+    midnight = {day: datetime.combine(day, datetime.min.time()) for day in start_pickers[LeaveType.OTHER].values}
+
+    def rows():
+        leave_id = 0
+        for employee_id in range(1, employee_count + 1):
+            # Normal approximation of a Poisson count around the requested mean
+            num_leaves = max(0, round(rng.gauss(mean, math.sqrt(mean)))) if mean else 0
+            for _ in range(num_leaves):
+                leave_type = type_picker.pick(rng)
+                start = start_pickers[leave_type].pick(rng)
+                low, high = leave_durations[leave_type]
+                status = (past_status if start < today else upcoming_status).pick(rng)
+                leave_id += 1
+                yield {
+                    "id": leave_id,
+                    "employee_id": employee_id,
+                    "leave_type": leave_type,
+                    "start_date": start,
+                    "end_date": start + timedelta(days=low + int(rng.random() * (high - low + 1))),
+                    "status": status,
+                    "reason": pick(rng, leave_reasons),
+                    "approved_by": pick(rng, approvers) if status != LeaveStatus.PENDING and approvers else None,
+                    # Requests are filed a day to a month ahead
+                    "created_at": midnight[start] - timedelta(seconds=86400 + int(rng.random() * 30 * 86400)),
+                }
+
+    count = insert_batches(Leave, rows(), options.batch_size)
+    print(f"Created {count} leave requests")
 
-    db.commit()
-    print(f"Created {leaves_created} leave requests")
 
-def seed_documents(admin_user):
+def seed_documents(rng, options, uploaders):
     """Create documents."""
-    for doc_data in documents_data:
-        document = Document(
-            name=doc_data['name'],
-            description=doc_data['description'],
-            file_path=f"uploads/{doc_data['name']}",
-            category=doc_data['category'],
-            uploaded_by=admin_user.id
-        )
-        db.add(document)
+    now = datetime.now()
+    category_picker = Weighted(category_weights)
+    file_type_picker = Weighted({(extension, content_type): weight for extension, content_type, weight in file_types})
 
-    db.commit()
-    print(f"Created {len(documents_data)} documents")
+    def rows():
+        for i, doc_data in enumerate(documents_data[:options.documents]):
+            yield {
+                "id": i + 1,
+                "name": doc_data['name'],
+                "description": doc_data['description'],
+                "file_path": f"uploads/{doc_data['name']}",
+                "file_size": None,
+                "content_type": None,
+                "category": doc_data['category'],
+                "uploaded_by": uploaders[0],
+                "created_at": now - timedelta(days=i),
+            }
+        for i in range(len(documents_data), options.documents):
+            category = category_picker.pick(rng)
+            topic = pick(rng, document_topics[category])
+            extension, content_type = file_type_picker.pick(rng)
+            name = f"{topic} {i + 1}{extension}"
+            yield {
+                "id": i + 1,
+                "name": name,
+                "description": f"{topic} ({category})",
+                "file_path": f"uploads/{name}",
+                # Log-normal sizes: mostly tens to hundreds of KB, a long tail of large files
+                "file_size": int(rng.lognormvariate(11.5, 1.2)),
+                "content_type": content_type,
+                "category": category,
+                "uploaded_by": pick(rng, uploaders),
+                "created_at": now - timedelta(minutes=int(rng.random() * 3 * 365 * 24 * 60)),
+            }
+
+    count = insert_batches(Document, rows(), options.batch_size)
+    print(f"Created {count} documents")
+
+
+def main(options=None):
+    options = options or parse_args([])
+    rng = random.Random(options.seed)
+    started = time.perf_counter()
 
-def main():
     print("Starting database seed...")
     print("-" * 40)
 
     # Clear existing data
     clear_data()
 
+    # Every account shares the demo password, so hash it only once
+    password_hash = get_password_hash(DEMO_PASSWORD)
+
     # Create users and employees
-    users_employees = seed_users_and_employees()
-    admin_user = users_employees[0][0]  # First user is admin
+    user_ids = seed_users_and_employees(rng, options, password_hash)
+    staff = user_ids[UserRole.ADMIN] + user_ids[UserRole.MANAGER]  # First user is admin
 
     # Create announcements
-    seed_announcements(admin_user)
+    seed_announcements(rng, options, staff)
 
-    # Create leaves
-    seed_leaves(users_employees)
+    # Create leaves; managers and admins approve them (employee ids match user ids)
+    seed_leaves(rng, options, max(options.employees, 1), staff)
 
     # Create documents
-    seed_documents(admin_user)
+    seed_documents(rng, options, staff)
+
+    # Rebuild dashboard counters
+    rebuild_counters(db)
 
     print("-" * 40)
-    print("Database seeded successfully!")
+    print(f"Database seeded successfully in {time.perf_counter() - started:.1f}s!")
     print("\nSample login credentials:")
     print("  Admin: armel.nizigiyimana@buychemjapan.com / password123")
     print("  Manager: john.smith@company.com / password123")
     print("  Employee: emily.brown@company.com / password123")
 
+
 if __name__ == "__main__":
-    main()
+    main(parse_args())
     db.close()
@@ -0,0 +1,108 @@
+"""Shared fixtures: a seeded throwaway database, a client, and SQL budgets.
+
+``@pytest.mark.query_budget(n)`` fails a test whose body runs more than
+``n`` statements on the request engine, and lists them. Fixture setup is
+not counted. ``count_statements`` gives the same count to tests that
+compare several requests instead.
+
+Run ``pytest --update-query-budgets`` to write the counts measured for
+parametrized ``query_budget`` tests to ``query_budgets.json``.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+BUDGETS_FILE = os.path.join(BACKEND_DIR, "query_budgets.json")
+sys.path.insert(0, BACKEND_DIR)
+
+_DIRECTORY = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DIRECTORY, 'tests.db')}"
+os.environ["INVALIDATION_BUS_URL"] = "memory://"
+os.environ["UPLOAD_DIR"] = os.path.join(_DIRECTORY, "uploads")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+PASSWORD = "password123"
+
+# Statement counts of parametrized query_budget tests, for --update-query-budgets
+_measured = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-query-budgets", action="store_true",
+        help="write the measured statement counts to query_budgets.json instead of enforcing them"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(n): fail when the test body runs more than n SQL statements"
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+
+    from app.database import async_engine
+    from app.metrics import count_queries
+
+    with count_queries(async_engine.sync_engine) as statements:
+        result = yield
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None:
+        _measured[callspec.id] = len(statements)
+    if item.config.getoption("update_query_budgets"):
+        return result
+
+    budget = marker.args[0] if marker.args else None
+    if budget is None:
+        pytest.fail(f"{len(statements)} statements and no budget yet; run with --update-query-budgets")
+    if len(statements) > budget:
+        listing = "\n".join(f"  {' '.join(statement.split())[:200]}" for statement in statements)
+        pytest.fail(f"{len(statements)} statements, budget {budget}:\n{listing}", pytrace=False)
+    return result
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if session.config.getoption("update_query_budgets") and _measured:
+        with open(BUDGETS_FILE, "w") as budgets_file:
+            json.dump(_measured, budgets_file, indent=2)
+            budgets_file.write("\n")
+
+
+@pytest.fixture(scope="session")
+def client():
+    import seed_data
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    seed_data.main(seed_data.parse_args([]))
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def login(client):
+    """Headers authenticating as ``email``, with its principal already cached."""
+    def headers_for(email: str) -> dict:
+        response = client.post("/auth/login", data={"username": email, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        client.get("/auth/me", headers=headers)
+        return headers
+    return headers_for
+
+
+@pytest.fixture
+def count_statements():
+    """Context manager collecting the statements the request engine runs inside it."""
+    from app.database import async_engine
+    from app.metrics import count_queries
+
+    return lambda: count_queries(async_engine.sync_engine)
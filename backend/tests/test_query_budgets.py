@@ -0,0 +1,108 @@
+"""SQL statement budgets of the hot endpoints, from ``query_budgets.json``.
+
+Every endpoint is called as an admin and as an employee through the real
+routers. A request over its budget (an N+1, a stray lazy load or an extra
+lookup) fails with the statements it ran.
+"""
+
+import json
+
+import pytest
+
+from conftest import BUDGETS_FILE
+
+ROLES = {
+    "admin": "armel.nizigiyimana@buychemjapan.com",
+    "employee": "emily.brown@company.com",
+}
+
+# (label, path, query params); {placeholders} are filled from the ``ids`` fixture
+HOT_REQUESTS = [
+    ("GET /auth/me", "/auth/me", {}),
+    ("GET /dashboard/summary", "/dashboard/summary", {}),
+    ("GET /employees/", "/employees/", {}),
+    ("GET /employees/?search", "/employees/", {"search": "emily"}),
+    ("GET /employees/?cursor", "/employees/", {"limit": 2, "cursor": "{employee_cursor}"}),
+    ("GET /employees/{id}", "/employees/{employee}", {}),
+    ("GET /leaves/", "/leaves/", {}),
+    ("GET /leaves/?status", "/leaves/", {"status": "pending"}),
+    ("GET /leaves/{id}", "/leaves/{leave}", {}),
+    ("GET /announcements/", "/announcements/", {}),
+    ("GET /announcements/{id}", "/announcements/{announcement}", {}),
+    ("GET /documents/", "/documents/", {}),
+    ("GET /documents/?search", "/documents/", {"search": "policy"}),
+    ("GET /documents/{id}", "/documents/{document}", {}),
+    ("GET /changes/", "/changes/", {"since": "{changes}"}),
+]
+
+
+def _cases():
+    with open(BUDGETS_FILE) as budgets_file:
+        budgets = json.load(budgets_file)
+    for role in ROLES:
+        for label, path, params in HOT_REQUESTS:
+            key = f"{role} {label}"
+            yield pytest.param(role, path, params, id=key, marks=pytest.mark.query_budget(budgets.get(key)))
+
+
+@pytest.fixture(scope="module")
+def headers(login):
+    return {role: login(email) for role, email in ROLES.items()}
+
+
+@pytest.fixture(scope="module")
+def ids(client, headers):
+    admin, employee = headers["admin"], headers["employee"]
+
+    # Something for /changes to render: an upsert of each synced table and a delete
+    changes = client.get("/changes/", headers=admin).json()["next"]
+    client.post("/leaves/", headers=employee, json={
+        "leave_type": "vacation", "start_date": "2030-01-07", "end_date": "2030-01-08"
+    })
+    client.put("/employees/1", headers=admin, json={"position": "Budget check"})
+    client.post("/documents/upload", headers=admin, files={"file": ("budget.txt", b"budget check")})
+    for title in ("Budget check", "Budget check, deleted"):
+        announcement = client.post("/announcements/", headers=admin, json={"title": title, "content": "-"})
+    client.delete(f"/announcements/{announcement.json()['id']}", headers=admin)
+
+    def first(path, params=None):
+        response = client.get(path, headers=admin, params=params or {})
+        return str(response.json()[0]["id"]), response.headers.get("x-next-cursor")
+
+    return {
+        "employee": first("/employees/")[0],
+        "employee_cursor": first("/employees/", {"limit": 2})[1],
+        "leave": first("/leaves/")[0],
+        "announcement": first("/announcements/")[0],
+        "document": first("/documents/")[0],
+        "changes": changes,
+    }
+
+
+@pytest.fixture
+def request_hot_endpoint(client, headers, ids):
+    def call(role, path, params):
+        params = {name: str(value).format(**ids) for name, value in params.items()}
+        return client.get(path.format(**ids), headers=headers[role], params=params)
+    return call
+
+
+@pytest.mark.parametrize("role, path, params", _cases())
+def test_hot_endpoint_within_budget(request_hot_endpoint, role, path, params):
+    response = request_hot_endpoint(role, path, params)
+    assert response.status_code < 500
+
+
+def test_changes_do_not_cost_a_statement_each(client, headers, count_statements):
+    admin = headers["admin"]
+    since = client.get("/changes/", headers=admin).json()["next"]
+
+    def feed_statements(announcements):
+        for number in range(announcements):
+            client.post("/announcements/", headers=admin, json={"title": f"Feed {number}", "content": "-"})
+        with count_statements() as statements:
+            response = client.get("/changes/", headers=admin, params={"since": since})
+        assert response.status_code == 200
+        return len(statements)
+
+    assert feed_statements(1) == feed_statements(20)
@@ -0,0 +1,26 @@
+"""Single use of ``/events`` tickets."""
+
+from app.utils.cache import ExpiringSet
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_redeemed_ticket_is_kept_until_it_expires_however_many_follow():
+    clock = Clock()
+    redeemed = ExpiringSet(ttl=30, timer=clock)
+    redeemed.add("first")
+    for number in range(100_000):
+        redeemed.add(f"ticket {number}")
+    clock.now = 29.9
+    assert "first" in redeemed
+
+    clock.now = 30
+    assert "first" not in redeemed
+    assert len(redeemed) == 0
+
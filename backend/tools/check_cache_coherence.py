@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Fail when a worker keeps serving data another worker has changed.
+
+Seeds a throwaway SQLite database and starts several API processes on it,
+sharing one invalidation bus. Each worker fills its announcement feed cache
+and opens an ``/events`` stream. The check then creates, updates and deletes
+an announcement and decides a leave, each on a different worker, and
+expects every worker to reflect the write within ``--deadline`` seconds
+(well below the cache TTL) and every stream to get the events.
+
+Usage: python tools/check_cache_coherence.py [--workers 3] [--bus memory://]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND)
+
+PASSWORD = "password123"
+ADMIN = "armel.nizigiyimana@buychemjapan.com"
+MANAGER = "john.smith@company.com"
+EMPLOYEE = "emily.brown@company.com"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_workers(count: int, env: dict) -> list:
+    import httpx
+
+    workers = []
+    # One at a time: each runs the migrations and startup tasks on the shared database
+    for _ in range(count):
+        port = free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND, env=env
+        )
+        workers.append((process, f"http://127.0.0.1:{port}"))
+        started = time.monotonic()
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/health").raise_for_status()
+                break
+            except httpx.HTTPError:
+                if process.poll() is not None or time.monotonic() - started > 30:
+                    raise RuntimeError(f"Worker on port {port} did not start")
+                time.sleep(0.2)
+    return workers
+
+
+async def listen(client, url: str, headers: dict, frames: list) -> None:
+    ticket = (await client.post(f"{url}/events/ticket", headers=headers)).json()["ticket"]
+    async with client.stream("GET", f"{url}/events/", params={"ticket": ticket}, timeout=None) as response:
+        buffer = b""
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            while b"\n\n" in buffer:
+                frame, buffer = buffer.split(b"\n\n", 1)
+                frames.append(frame)
+
+
+async def converge(description: str, probe, deadline: float) -> float:
+    """Seconds until ``probe()`` holds, or raise once ``deadline`` has passed."""
+    started = time.monotonic()
+    while not await probe():
+        if time.monotonic() - started > deadline:
+            raise AssertionError(f"{description}: still stale after {deadline}s")
+        await asyncio.sleep(0.02)
+    return time.monotonic() - started
+
+
+async def check(urls: list, deadline: float) -> list:
+    import httpx
+    import orjson
+
+    lags = []
+    async with httpx.AsyncClient(timeout=10) as client:
+        async def login(email):
+            response = await client.post(f"{urls[0]}/auth/login", data={"username": email, "password": PASSWORD})
+            return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        admin, manager, employee = await login(ADMIN), await login(MANAGER), await login(EMPLOYEE)
+
+        async def titles(url):
+            response = await client.get(f"{url}/announcements/", headers=employee, params={"limit": 100})
+            response.raise_for_status()
+            return {row["id"]: row["title"] for row in response.json()}
+
+        # Fill every worker's feed cache first
+        for url in urls:
+            await titles(url)
+            await titles(url)
+
+        streams = [[] for _ in urls]
+        listeners = [asyncio.create_task(listen(client, url, employee, frames)) for url, frames in zip(urls, streams)]
+        await asyncio.sleep(0.5)
+
+        async def everywhere(description, predicate):
+            for url in urls:
+                lag = await converge(f"{description} on {url}", lambda: predicate(url), deadline)
+                lags.append(lag)
+                print(f"OK   {description} on {url} after {lag * 1000:.0f} ms")
+
+        async def streamed(description, event, matches):
+            for url, frames in zip(urls, streams):
+                async def received():
+                    return any(
+                        frame.startswith(b"event: " + event) and matches(orjson.loads(frame.split(b"data: ", 1)[1]))
+                        for frame in frames
+                    )
+                await converge(f"{description} on {url}", received, deadline)
+                print(f"OK   {description} on {url}")
+
+        created = (await client.post(
+            f"{urls[0]}/announcements/", headers=manager,
+            json={"title": "Coherence check", "content": "Created on worker 0", "priority": "high"}
+        )).json()
+        await everywhere("created announcement listed", lambda url: _has(titles(url), created["id"], "Coherence check"))
+        await streamed("announcement event", b"announcement", lambda data: data["id"] == created["id"])
+
+        await client.put(
+            f"{urls[1 % len(urls)]}/announcements/{created['id']}", headers=manager,
+            json={"title": "Coherence check, updated", "content": "Updated", "priority": "high"}
+        )
+        await everywhere(
+            "updated announcement listed", lambda url: _has(titles(url), created["id"], "Coherence check, updated")
+        )
+
+        await client.delete(f"{urls[2 % len(urls)]}/announcements/{created['id']}", headers=admin)
+        await everywhere("deleted announcement gone", lambda url: _lacks(titles(url), created["id"]))
+
+        leave = (await client.post(
+            f"{urls[0]}/leaves/", headers=employee,
+            json={"leave_type": "vacation", "start_date": "2030-01-07", "end_date": "2030-01-08"}
+        )).json()
+        await client.put(f"{urls[-1]}/leaves/{leave['id']}/approve", headers=manager, json={"status": "approved"})
+        await streamed(
+            "leave event", b"leave", lambda data: data["id"] == leave["id"] and data["status"] == "approved"
+        )
+
+        for listener in listeners:
+            listener.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+    return lags
+
+
+async def _has(titles, announcement_id, title) -> bool:
+    return (await titles).get(announcement_id) == title
+
+
+async def _lacks(titles, announcement_id) -> bool:
+    return announcement_id not in await titles
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--deadline", type=float, default=2.0, help="Seconds a worker may stay stale")
+    parser.add_argument("--bus", help="INVALIDATION_BUS_URL to check (default: a throwaway SQLite bus)")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'coherence.db')}",
+        "INVALIDATION_BUS_URL": args.bus or f"sqlite:///{os.path.join(directory, 'bus.db')}",
+        "UPLOAD_DIR": os.path.join(directory, "uploads"),
+        "BCRYPT_ROUNDS": "4",
+    }
+    os.environ.update(env)
+    import seed_data
+    seed_data.main(seed_data.parse_args([]))
+
+    workers = start_workers(args.workers, env)
+    try:
+        lags = asyncio.run(check([url for _, url in workers], args.deadline))
+    except AssertionError as exc:
+        print(f"FAIL {exc}")
+        return 1
+    finally:
+        for process, _ in workers:
+            process.terminate()
+        for process, _ in workers:
+            process.wait(timeout=10)
+    print(f"Every worker saw every write, within {max(lags) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
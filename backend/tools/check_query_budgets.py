@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Fail when a hot endpoint issues more SQL statements than its budget.
+
+Runs ``tests/test_query_budgets.py``, which calls every hot endpoint as an
+admin and as an employee under ``@pytest.mark.query_budget`` with the
+budgets in ``query_budgets.json``. ``--update`` rewrites that baseline with
+the measured counts. The same tests run with the rest of the suite under
+``pytest``.
+
+Usage: python tools/check_query_budgets.py [--update]
+"""
+
+import argparse
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+TESTS = os.path.join(BACKEND_DIR, "tests", "test_query_budgets.py")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="rewrite the baseline with the measured counts")
+    args = parser.parse_args()
+
+    options = ["-q", "-p", "no:cacheprovider"] + (["--update-query-budgets"] if args.update else [])
+    if pytest.main([TESTS, *options]) != 0:
+        print("Some hot endpoints are over their query budget")
+        return 1
+    if args.update:
+        print("Wrote the measured budgets to query_budgets.json")
+    else:
+        print("Every hot endpoint is within its query budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Fail when a hot API query falls back to a full table scan.
+
+Seeds a throwaway SQLite database, calls every hot endpoint through the real
+routers, captures each SELECT they issue and runs EXPLAIN QUERY PLAN on it.
+A ``SCAN <table>`` plan step fails the check when the statement filters that
+table by equality (an index should have been searched instead). Otherwise it
+is only accepted when the statement is LIMITed and needs no separate sort,
+i.e. the scan walks the table in the requested order and stops early.
+
+Usage: python tools/check_query_plans.py
+"""
+
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'query_plans.db')}"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+# Tables that are read in full on purpose
+ALLOW_FULL_SCAN = {"counters"}
+
+SCAN = re.compile(r"^SCAN (\w+)(?: USING (?:COVERING )?INDEX \w+)?$")
+
+
+def _equality_filtered(statement: str, table: str) -> bool:
+    return re.search(rf"\b{table}\.\w+ (?:= |IN \()", statement) is not None
+
+
+def hot_requests(ids):
+    return [
+        ("GET", "/auth/me", {}),
+        ("GET", "/dashboard/summary", {}),
+        ("GET", "/employees/", {}),
+        ("GET", "/employees/", {"department": "Engineering"}),
+        ("GET", "/employees/", {"search": "emily"}),
+        ("GET", "/employees/", {"limit": 2, "cursor": ids["employee_cursor"]}),
+        ("GET", f"/employees/{ids['employee']}", {}),
+        ("GET", "/leaves/", {}),
+        ("GET", "/leaves/", {"status": "pending"}),
+        ("GET", "/leaves/", {"limit": 2, "cursor": ids["leave_cursor"]}),
+        ("GET", f"/leaves/{ids['leave']}", {}),
+        ("GET", "/announcements/", {}),
+        ("GET", "/announcements/", {"priority": "high"}),
+        ("GET", f"/announcements/{ids['announcement']}", {}),
+        ("GET", "/documents/", {}),
+        ("GET", "/documents/", {"category": "Policy"}),
+        ("GET", "/documents/", {"search": "policy"}),
+        ("GET", f"/documents/{ids['document']}", {}),
+        ("GET", "/changes/", {"since": 0}),
+    ]
+
+
+def main() -> int:
+    import seed_data
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.database import engine, async_engine
+    from app.main import app
+
+    seed_data.main()
+    client = TestClient(app)
+
+    def login(email):
+        response = client.post("/auth/login", data={"username": email, "password": "password123"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    admin = login("armel.nizigiyimana@buychemjapan.com")
+    employee = login("emily.brown@company.com")
+
+    def first_id(path, params=None):
+        response = client.get(path, headers=admin, params=params or {})
+        return response.json()[0]["id"], response.headers.get("x-next-cursor")
+
+    employee_id, employee_cursor = first_id("/employees/", {"limit": 2})
+    leave_id, leave_cursor = first_id("/leaves/", {"limit": 2})
+    ids = {
+        "employee": employee_id,
+        "employee_cursor": employee_cursor,
+        "leave": leave_id,
+        "leave_cursor": leave_cursor,
+        "announcement": first_id("/announcements/")[0],
+        "document": first_id("/documents/")[0],
+    }
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    failures = 0
+    # Handlers run on the async engine; plans are explained on the blocking one
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        for headers, role in ((admin, "admin"), (employee, "employee")):
+            for method, path, params in hot_requests(ids):
+                captured.clear()
+                response = client.request(method, path, headers=headers, params=params)
+                if response.status_code >= 500:
+                    print(f"FAIL {role} {path} {params}: HTTP {response.status_code}")
+                    failures += 1
+                    continue
+                for statement, parameters in list(captured):
+                    with engine.connect() as conn:
+                        plan = conn.exec_driver_sql(
+                            f"EXPLAIN QUERY PLAN {statement}", parameters
+                        ).fetchall()
+                    steps = [row[-1] for row in plan]
+                    sorted_separately = any("TEMP B-TREE" in step for step in steps)
+                    limited = re.search(r"\bLIMIT\b", statement, re.IGNORECASE) is not None
+                    for step in steps:
+                        match = SCAN.match(step)
+                        if not match or match.group(1) in ALLOW_FULL_SCAN:
+                            continue
+                        equality = _equality_filtered(statement, match.group(1))
+                        if limited and not sorted_separately and not equality:
+                            continue
+                        failures += 1
+                        print(f"FAIL {role} {method} {path} {params}")
+                        print(f"     {' '.join(statement.split())}")
+                        for plan_step in steps:
+                            print(f"       {plan_step}")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    if failures:
+        print(f"{failures} full table scan(s) on hot queries")
+        return 1
+    print("No hot query falls back to a full table scan")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Fail when reads and writes are not routed as DATABASE_REPLICA_URLS promises.
+
+Seeds a throwaway SQLite primary, copies it to a second file and points
+``DATABASE_REPLICA_URLS`` at the copy. The copy is then marked: a text
+column of every employee, leave, announcement and document is rewritten in
+the replica only, so each response shows which database it was read from.
+Statements are also counted per engine.
+
+The check expects list and detail reads to come from the replica without
+touching the primary, the announcement feed cache to be filled from the
+primary (a lagging replica must not put stale rows into it), and writes,
+and the rows they return, to go to the primary and leave the replica
+untouched.
+
+Usage: python tools/check_read_replicas.py
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+from collections import Counter
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, BACKEND_DIR)
+
+DIRECTORY = tempfile.mkdtemp()
+PRIMARY = os.path.join(DIRECTORY, "primary.db")
+REPLICA = os.path.join(DIRECTORY, "replica.db")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{PRIMARY}"
+os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{REPLICA}"
+os.environ["INVALIDATION_BUS_URL"] = "memory://"
+os.environ["UPLOAD_DIR"] = os.path.join(DIRECTORY, "uploads")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+ADMIN = "armel.nizigiyimana@buychemjapan.com"
+MARKER = "read from the replica"
+
+# Column of each table rewritten in the replica; responses carry it under the same name
+MARKED = {
+    "employees": "position",
+    "leaves": "reason",
+    "announcements": "content",
+    "documents": "description",
+}
+
+# (label, path, table, where the rows come from)
+READS = [
+    ("GET /employees/", "/employees/", "employees", "replica"),
+    ("GET /employees/{id}", "/employees/{employees}", "employees", "replica"),
+    ("GET /leaves/", "/leaves/", "leaves", "replica"),
+    ("GET /leaves/{id}", "/leaves/{leaves}", "leaves", "replica"),
+    ("GET /announcements/{id}", "/announcements/{announcements}", "announcements", "replica"),
+    ("GET /documents/", "/documents/", "documents", "replica"),
+    ("GET /documents/{id}", "/documents/{documents}", "documents", "replica"),
+    # The feed cache is shared by every reader, so it is only ever filled from the primary
+    ("GET /announcements/", "/announcements/", "announcements", "primary"),
+]
+
+
+def copy_to_replica() -> None:
+    source = sqlite3.connect(PRIMARY)
+    replica = sqlite3.connect(REPLICA)
+    source.backup(replica)
+    source.close()
+    for table, column in MARKED.items():
+        replica.execute(f"UPDATE {table} SET {column} = ?", (MARKER,))
+    replica.commit()
+    replica.close()
+
+
+def count(path: str, sql: str, *params) -> int:
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(sql, params).fetchone()[0]
+    finally:
+        connection.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    import seed_data
+    seed_data.main(seed_data.parse_args([]))
+    copy_to_replica()
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.database import async_engine, replica_engines
+    from app.main import app
+
+    statements = Counter()
+    for name, request_engine in (("primary", async_engine), ("replica", replica_engines[0])):
+        def counted(conn, cursor, statement, parameters, context, executemany, name=name):
+            statements[name] += 1
+        event.listen(request_engine.sync_engine, "before_cursor_execute", counted)
+
+    failures = []
+
+    def check(label: str, ok: bool, detail: str) -> None:
+        if ok:
+            print(f"OK   {label}: {detail}")
+        else:
+            failures.append(f"{label}: {detail}")
+
+    with TestClient(app) as client:
+        response = client.post("/auth/login", data={"username": ADMIN, "password": "password123"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        # Warm the principal cache, so that reads do not look the user up on the primary
+        client.get("/auth/me", headers=headers)
+        ids = {table: client.get(f"/{table}/", headers=headers).json()[0]["id"] for table in MARKED}
+
+        for label, path, table, source in READS:
+            statements.clear()
+            response = client.get(path.format(**ids), headers=headers)
+            if response.status_code != 200:
+                failures.append(f"{label}: answered {response.status_code}")
+                continue
+            body = response.json()
+            rows = body if isinstance(body, list) else [body]
+            from_replica = sum(row[MARKED[table]] == MARKER for row in rows)
+            if source == "replica":
+                check(
+                    label, from_replica == len(rows) and statements["primary"] == 0,
+                    f"{from_replica} of {len(rows)} rows from the replica, {statements['replica']} statements "
+                    f"there, {statements['primary']} on the primary"
+                )
+            else:
+                check(label, from_replica == 0, f"{len(rows) - from_replica} of {len(rows)} rows from the primary")
+
+        statements.clear()
+        response = client.put(f"/employees/{ids['employees']}", headers=headers, json={"position": "Written"})
+        written = count(PRIMARY, "SELECT count(*) FROM employees WHERE position = 'Written'")
+        leaked = count(REPLICA, "SELECT count(*) FROM employees WHERE position = 'Written'")
+        check(
+            "PUT /employees/{id}",
+            response.status_code == 200 and response.json()["position"] == "Written"
+            and written == 1 and leaked == 0 and statements["replica"] == 0,
+            f"written to the primary, {statements['replica']} statements on the replica"
+        )
+
+        statements.clear()
+        response = client.post(
+            "/announcements/", headers=headers,
+            json={"title": "Replica routing check", "content": "Written", "priority": "low"}
+        )
+        written = count(PRIMARY, "SELECT count(*) FROM announcements WHERE title = 'Replica routing check'")
+        leaked = count(REPLICA, "SELECT count(*) FROM announcements WHERE title = 'Replica routing check'")
+        check(
+            "POST /announcements/",
+            response.status_code == 201 and written == 1 and leaked == 0 and statements["replica"] == 0,
+            f"written to the primary, {statements['replica']} statements on the replica"
+        )
+
+        titles = [row["title"] for row in client.get("/announcements/", headers=headers).json()]
+        check(
+            "GET /announcements/ after a write", "Replica routing check" in titles,
+            "the new announcement is listed although the replica lacks it"
+        )
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        return 1
+    print("Reads go to the replica and writes to the primary")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Fail when uploads are buffered instead of streamed.
+
+Starts the API on a throwaway database and checks three things:
+
+* uploading a large file leaves the server's peak memory (VmHWM) within
+  ``--max-growth-mb`` of what it was before;
+* an upload whose Content-Length is over ``MAX_UPLOAD_SIZE`` gets its 413
+  before the body is sent;
+* a chunked upload that grows past the limit gets its 413 while the client
+  is still sending, long before the whole body is through.
+
+Linux only (reads /proc). Usage: python tools/check_upload_streaming.py
+"""
+
+import argparse
+import os
+import select
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND)
+
+ADMIN = "armel.nizigiyimana@buychemjapan.com"
+PASSWORD = "password123"
+BOUNDARY = "uploadstreamingcheck"
+MB = 1024 * 1024
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmHWM not found")
+
+
+def multipart_head(filename: str) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+
+
+MULTIPART_TAIL = f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def request_head(token: str, length: int = None) -> bytes:
+    lines = [
+        "POST /documents/upload HTTP/1.1",
+        "Host: 127.0.0.1",
+        f"Authorization: Bearer {token}",
+        f"Content-Type: multipart/form-data; boundary={BOUNDARY}",
+        f"Content-Length: {length}" if length is not None else "Transfer-Encoding: chunked",
+        "Connection: close",
+    ]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+def send_until_answered(port: int, head: bytes, chunks, chunked: bool):
+    """Send ``chunks`` until the server answers; returns (status, body bytes sent)."""
+    sent = 0
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.sendall(head)
+        for chunk in chunks:
+            readable, _, _ = select.select([sock], [], [], 0)
+            if readable:
+                break
+            try:
+                sock.sendall(b"%x\r\n%s\r\n" % (len(chunk), chunk) if chunked else chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                break
+            sent += len(chunk)
+        sock.settimeout(30)
+        response = sock.recv(65536)
+    return int(response.split(b" ", 2)[1]), sent
+
+
+def body_chunks(size: int, chunk_size: int = MB):
+    block = os.urandom(chunk_size)
+    for offset in range(0, size, chunk_size):
+        yield block[:min(chunk_size, size - offset)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=int, default=256, help="Size of the upload that must stream")
+    parser.add_argument("--limit-mb", type=int, default=64, help="MAX_UPLOAD_SIZE of the server under test")
+    parser.add_argument("--max-growth-mb", type=float, default=32, help="Peak memory growth allowed")
+    args = parser.parse_args()
+
+    import httpx
+
+    directory = tempfile.mkdtemp()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'uploads.db')}",
+        "INVALIDATION_BUS_URL": "memory://",
+        "UPLOAD_DIR": os.path.join(directory, "uploads"),
+        "BCRYPT_ROUNDS": "4",
+    }
+    os.environ.update(env)
+    import seed_data
+    seed_data.main()
+
+    failures = []
+
+    def server(limit_mb: int):
+        port = free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND, env={**env, "MAX_UPLOAD_SIZE": str(limit_mb * MB)}
+        )
+        started = time.monotonic()
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/health").raise_for_status()
+                return process, port
+            except httpx.HTTPError:
+                if process.poll() is not None or time.monotonic() - started > 30:
+                    raise RuntimeError("The API did not start")
+                time.sleep(0.2)
+
+    def login(port: int) -> str:
+        response = httpx.post(
+            f"http://127.0.0.1:{port}/auth/login", data={"username": ADMIN, "password": PASSWORD}
+        )
+        return response.json()["access_token"]
+
+    # A large upload must not raise peak memory
+    process, port = server(args.size_mb + 1)
+    try:
+        token = login(port)
+        httpx.get(f"http://127.0.0.1:{port}/documents/", headers={"Authorization": f"Bearer {token}"})
+        before = peak_rss_mb(process.pid)
+        size = args.size_mb * MB
+        head = multipart_head("large.bin")
+        status, _ = send_until_answered(
+            port, request_head(token, len(head) + size + len(MULTIPART_TAIL)),
+            [head, *body_chunks(size), MULTIPART_TAIL], chunked=False
+        )
+        growth = peak_rss_mb(process.pid) - before
+        if status != 201:
+            failures.append(f"{args.size_mb} MB upload answered {status}")
+        elif growth > args.max_growth_mb:
+            failures.append(f"{args.size_mb} MB upload raised peak memory by {growth:.1f} MB")
+        else:
+            print(f"OK   {args.size_mb} MB upload raised peak memory by {growth:.1f} MB")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    # Oversize uploads must be cut off, not received in full
+    process, port = server(args.limit_mb)
+    try:
+        token = login(port)
+        oversize = 4 * args.limit_mb * MB
+        head = multipart_head("oversize.bin")
+
+        status, sent = send_until_answered(
+            port, request_head(token, len(head) + oversize + len(MULTIPART_TAIL)),
+            [head, *body_chunks(oversize)], chunked=False
+        )
+        if status != 413 or sent > args.limit_mb * MB:
+            failures.append(f"declared oversize upload: {status} after {sent / MB:.0f} MB sent")
+        else:
+            print(f"OK   declared oversize upload refused with 413 after {sent / MB:.0f} MB sent")
+
+        status, sent = send_until_answered(
+            port, request_head(token), [head, *body_chunks(oversize)], chunked=True
+        )
+        # Socket buffers let a few MB past the limit before the answer is seen
+        if status != 413 or sent > 2 * args.limit_mb * MB:
+            failures.append(f"chunked oversize upload: {status} after {sent / MB:.0f} MB sent")
+        else:
+            print(f"OK   chunked oversize upload refused with 413 after {sent / MB:.0f} MB of {oversize // MB} MB")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        return 1
+    print("Uploads stream with flat memory and oversize bodies are cut off mid-transfer")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+// Write .br, .gz (and .zst where Node supports it) next to every text asset
+// in dist/ so the API can serve them without compressing on each request.
+import { readdir, readFile, stat, writeFile } from 'node:fs/promises'
+import { join, extname } from 'node:path'
+import zlib from 'node:zlib'
+
+const DIST = new URL('../dist/', import.meta.url).pathname
+const EXTENSIONS = new Set(['.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.map', '.xml', '.webmanifest'])
+const MIN_SIZE = 1024
+
+const codecs = [
+  ['.br', (data) => zlib.brotliCompressSync(data, {
+    params: {
+      [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+      [zlib.constants.BROTLI_PARAM_SIZE_HINT]: data.length
+    }
+  })],
+  ['.gz', (data) => zlib.gzipSync(data, { level: zlib.constants.Z_BEST_COMPRESSION })]
+]
+if (zlib.zstdCompressSync) {
+  codecs.push(['.zst', (data) => zlib.zstdCompressSync(data, {
+    params: { [zlib.constants.ZSTD_c_compressionLevel]: 19 }
+  })])
+}
+
+async function* files(dir) {
+  for (const entry of await readdir(dir, { withFileTypes: true })) {
+    const path = join(dir, entry.name)
+    if (entry.isDirectory()) yield* files(path)
+    else yield path
+  }
+}
+
+let original = 0
+let written = 0
+for await (const path of files(DIST)) {
+  if (!EXTENSIONS.has(extname(path)) || (await stat(path)).size < MIN_SIZE) continue
+  const data = await readFile(path)
+  for (const [suffix, compress] of codecs) {
+    const compressed = compress(data)
+    // A variant that is not smaller is never worth sending
+    if (compressed.length < data.length) {
+      await writeFile(path + suffix, compressed)
+      written++
+    }
+  }
+  original++
+}
+console.log(`precompressed ${original} files into ${written} variants (${codecs.map(([suffix]) => suffix).join(', ')})`)
@@ -0,0 +1,84 @@
+import { useEffect, useRef } from 'react'
+import api from '../services/api'
+
+// One EventSource per tab, shared by every page listening to /events and
+// closed once the last of them unmounts. It is opened with a single-use
+// ticket rather than the access token, which would end up in access logs.
+// A spent ticket cannot reopen the stream, so instead of letting EventSource
+// reconnect by itself (after an error, or when the server ends the stream
+// as the token expires), every reconnect fetches a new ticket.
+const RECONNECT_DELAY = 5000
+
+const handlers = new Map()
+let source = null
+let connecting = false
+let reconnect = null
+let listeners = 0
+
+function dispatch(event) {
+  const data = JSON.parse(event.data)
+  handlers.get(event.type)?.forEach((handler) => handler(data))
+}
+
+async function connect() {
+  reconnect = null
+  if (connecting || source || !localStorage.getItem('token')) return
+  connecting = true
+  let ticket = null
+  try {
+    ticket = (await api.post('/events/ticket')).data.ticket
+  } catch {
+    // Retried below; a 401 has already sent the user to the login page
+  } finally {
+    connecting = false
+  }
+  if (listeners === 0) return
+  if (!ticket) {
+    reconnect = setTimeout(connect, RECONNECT_DELAY)
+    return
+  }
+  source = new EventSource(`${api.defaults.baseURL}/events/?ticket=${encodeURIComponent(ticket)}`)
+  handlers.forEach((_, type) => source.addEventListener(type, dispatch))
+  source.onerror = () => {
+    source.close()
+    source = null
+    reconnect = setTimeout(connect, RECONNECT_DELAY)
+  }
+}
+
+function listen(type, handler) {
+  if (!handlers.has(type)) {
+    handlers.set(type, new Set())
+    source?.addEventListener(type, dispatch)
+  }
+  handlers.get(type).add(handler)
+  if (listeners++ === 0) connect()
+}
+
+function unlisten(type, handler) {
+  const forType = handlers.get(type)
+  forType.delete(handler)
+  if (forType.size === 0) {
+    handlers.delete(type)
+    source?.removeEventListener(type, dispatch)
+  }
+  listeners--
+  if (listeners === 0) {
+    clearTimeout(reconnect)
+    reconnect = null
+    source?.close()
+    source = null
+  }
+}
+
+// Call handler with the parsed data of every `type` event the server pushes
+export function useServerEvent(type, handler) {
+  const handlerRef = useRef(handler)
+  handlerRef.current = handler
+
+  useEffect(() => {
+    const listener = (data) => handlerRef.current(data)
+    listen(type, listener)
+    return () => unlisten(type, listener)
+  }, [type])
+}
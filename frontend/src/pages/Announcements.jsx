@@ -1,7 +1,11 @@
 import { useState, useEffect } from 'react'
 import api from '../services/api'
+import { useServerEvent } from '../hooks/useServerEvent'
 import { useAuth } from '../context/AuthContext'
 
+// Only the fields the cards show
+const LIST_FIELDS = 'id,title,content,priority,created_at'
+
 function Announcements() {
   const { user } = useAuth()
   const [announcements, setAnnouncements] = useState([])
@@ -17,9 +21,17 @@ function Announcements() {
     fetchAnnouncements()
   }, [])
 
+  const addAnnouncement = (announcement) => {
+    setAnnouncements((current) => current.some((a) => a.id === announcement.id)
+      ? current
+      : [announcement, ...current])
+  }
+
+  useServerEvent('announcement', addAnnouncement)
+
   const fetchAnnouncements = async () => {
     try {
-      const response = await api.get('/announcements')
+      const response = await api.get('/announcements', { params: { fields: LIST_FIELDS } })
       setAnnouncements(response.data)
     } catch (error) {
       console.error('Failed to fetch announcements:', error)
@@ -31,10 +43,10 @@ function Announcements() {
   const handleSubmit = async (e) => {
     e.preventDefault()
     try {
-      await api.post('/announcements', formData)
+      const response = await api.post('/announcements', formData)
       setShowModal(false)
       setFormData({ title: '', content: '', priority: 'medium' })
-      fetchAnnouncements()
+      addAnnouncement(response.data)
     } catch (error) {
       alert(error.response?.data?.detail || 'Failed to create announcement')
     }
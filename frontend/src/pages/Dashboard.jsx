@@ -12,9 +12,7 @@ const COLORS = ['#3B82F6', '#10B981', '#F59E0B', '#EF4444', '#8B5CF6', '#EC4899'
 function Dashboard() {
   const { user } = useAuth()
   const [announcements, setAnnouncements] = useState([])
-  const [stats, setStats] = useState({ employees: 0, pendingLeaves: 0, documents: 0, totalLeaves: 0 })
-  const [employees, setEmployees] = useState([])
-  const [leaves, setLeaves] = useState([])
+  const [summary, setSummary] = useState(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
 
@@ -24,22 +22,9 @@ function Dashboard() {
 
   const fetchData = async () => {
     try {
-      const [announcementsRes, employeesRes, leavesRes, documentsRes] = await Promise.all([
-        api.get('/announcements?limit=5'),
-        api.get('/employees'),
-        api.get('/leaves'),
-        api.get('/documents')
-      ])
-
-      setAnnouncements(announcementsRes.data)
-      setEmployees(employeesRes.data)
-      setLeaves(leavesRes.data)
-      setStats({
-        employees: employeesRes.data.length,
-        pendingLeaves: leavesRes.data.filter(l => l.status === 'pending').length,
-        documents: documentsRes.data.length,
-        totalLeaves: leavesRes.data.length
-      })
+      const response = await api.get('/dashboard/summary')
+      setSummary(response.data)
+      setAnnouncements(response.data.recent_announcements)
     } catch (err) {
       console.error('Failed to fetch dashboard data:', err)
       setError(err.message)
@@ -48,53 +33,44 @@ function Dashboard() {
     }
   }
 
+  const stats = {
+    employees: summary?.total_employees ?? 0,
+    pendingLeaves: summary?.leaves_by_status.pending ?? 0,
+    documents: summary?.total_documents ?? 0,
+    totalLeaves: summary?.total_leaves ?? 0
+  }
+
   // Process data for charts
   const getDepartmentData = () => {
-    const deptCount = {}
-    employees.forEach(emp => {
-      const dept = emp.department || 'Unknown'
-      deptCount[dept] = (deptCount[dept] || 0) + 1
-    })
-    return Object.entries(deptCount).map(([name, value]) => ({ name, value }))
+    return Object.entries(summary.employees_by_department).map(([name, value]) => ({ name, value }))
   }
 
   const getLeaveStatusData = () => {
-    const statusCount = { pending: 0, approved: 0, rejected: 0 }
-    leaves.forEach(leave => {
-      statusCount[leave.status] = (statusCount[leave.status] || 0) + 1
-    })
+    const statusCount = summary.leaves_by_status
     return [
-      { name: 'Pending', value: statusCount.pending, color: '#F59E0B' },
-      { name: 'Approved', value: statusCount.approved, color: '#10B981' },
-      { name: 'Rejected', value: statusCount.rejected, color: '#EF4444' }
+      { name: 'Pending', value: statusCount.pending || 0, color: '#F59E0B' },
+      { name: 'Approved', value: statusCount.approved || 0, color: '#10B981' },
+      { name: 'Rejected', value: statusCount.rejected || 0, color: '#EF4444' }
     ]
   }
 
   const getLeaveTypeData = () => {
-    const typeCount = {}
-    leaves.forEach(leave => {
-      const type = leave.leave_type || 'other'
-      typeCount[type] = (typeCount[type] || 0) + 1
-    })
-    return Object.entries(typeCount).map(([name, count]) => ({
+    return Object.entries(summary.leaves_by_type).map(([name, count]) => ({
       name: name.charAt(0).toUpperCase() + name.slice(1),
       count
     }))
   }
 
   const getMonthlyLeaveData = () => {
-    const monthlyData = {}
     const monthNames = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
-    leaves.forEach(leave => {
-      const date = new Date(leave.start_date)
-      const monthKey = `${monthNames[date.getMonth()]} ${date.getFullYear()}`
-      monthlyData[monthKey] = (monthlyData[monthKey] || 0) + 1
-    })
-
-    return Object.entries(monthlyData)
+    return Object.entries(summary.leaves_by_month)
+      .sort(([a], [b]) => a.localeCompare(b))
       .slice(-6)
-      .map(([month, requests]) => ({ month, requests }))
+      .map(([key, requests]) => {
+        const [year, month] = key.split('-')
+        return { month: `${monthNames[Number(month) - 1]} ${year}`, requests }
+      })
   }
 
   const getPriorityColor = (priority) => {
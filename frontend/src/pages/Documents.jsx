@@ -1,6 +1,9 @@
 import { useState, useEffect, useRef } from 'react'
 import api from '../services/api'
 
+// Only the columns the list shows
+const LIST_FIELDS = 'id,name,description,category,created_at'
+
 function Documents() {
   const [documents, setDocuments] = useState([])
   const [loading, setLoading] = useState(true)
@@ -20,7 +23,7 @@ function Documents() {
 
   const fetchDocuments = async () => {
     try {
-      const params = search ? { search } : {}
+      const params = { fields: LIST_FIELDS, ...(search ? { search } : {}) }
       const response = await api.get('/documents', { params })
       setDocuments(response.data)
     } catch (error) {
@@ -2,6 +2,9 @@ import { useState, useEffect } from 'react'
 import api from '../services/api'
 import { useAuth } from '../context/AuthContext'
 
+// Only the columns the table shows
+const LIST_FIELDS = 'id,first_name,last_name,email,phone,department,position'
+
 function Employees() {
   const { user } = useAuth()
   const [employees, setEmployees] = useState([])
@@ -23,7 +26,7 @@ function Employees() {
 
   const fetchEmployees = async () => {
     try {
-      const params = search ? { search } : {}
+      const params = { fields: LIST_FIELDS, ...(search ? { search } : {}) }
       const response = await api.get('/employees', { params })
       setEmployees(response.data)
     } catch (error) {
@@ -1,7 +1,11 @@
 import { useState, useEffect } from 'react'
 import api from '../services/api'
+import { useServerEvent } from '../hooks/useServerEvent'
 import { useAuth } from '../context/AuthContext'
 
+// Only the columns the table shows
+const LIST_FIELDS = 'id,leave_type,start_date,end_date,reason,status'
+
 function Leaves() {
   const { user } = useAuth()
   const [leaves, setLeaves] = useState([])
@@ -19,9 +23,17 @@ function Leaves() {
     fetchLeaves()
   }, [statusFilter])
 
+  const updateLeave = (leave) => {
+    setLeaves((current) => current
+      .map((l) => (l.id === leave.id ? { ...l, status: leave.status } : l))
+      .filter((l) => !statusFilter || l.status === statusFilter))
+  }
+
+  useServerEvent('leave', updateLeave)
+
   const fetchLeaves = async () => {
     try {
-      const params = statusFilter ? { status: statusFilter } : {}
+      const params = { fields: LIST_FIELDS, ...(statusFilter ? { status: statusFilter } : {}) }
       const response = await api.get('/leaves', { params })
       setLeaves(response.data)
     } catch (error) {
@@ -45,8 +57,8 @@ function Leaves() {
 
   const handleApprove = async (leaveId, status) => {
     try {
-      await api.put(`/leaves/${leaveId}/approve`, { status })
-      fetchLeaves()
+      const response = await api.put(`/leaves/${leaveId}/approve`, { status })
+      updateLeave(response.data)
     } catch (error) {
       alert(error.response?.data?.detail || 'Failed to update leave status')
     }